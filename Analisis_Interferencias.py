@@ -1,11 +1,55 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Backend sin interfaz: solo se guardan imágenes, sin sondear Qt/Tk
 import matplotlib.pyplot as plt
 import seaborn as sns
 import argparse
 import sys
-from collections import Counter
-import re
+from io import BytesIO, StringIO, TextIOWrapper
+from itertools import islice
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:  # pyarrow es opcional: sin él se usa el lector manual en Python
+    pa = None
+    pacsv = None
+
+# Tipos compactos para las columnas más usadas: enteros pequeños para las
+# métricas y categorías (codificación por diccionario) para los textos repetidos
+CSV_DTYPES = {
+    'RSSI': 'Int16',
+    'Channel': 'Int16',
+    'SSID': 'category',
+    'AuthMode': 'category',
+}
+
+# Errores esperables al parsear un CSV inconsistente (ParserError, ArrowInvalid,
+# UnicodeDecodeError y pyarrow ausente); cualquier otro error no se reintenta
+CSV_PARSE_ERRORS = (pd.errors.ParserError, ValueError, ImportError)
+
+# Canales no superpuestos en 2.4 GHz (el arreglo se usa para operaciones de conjuntos)
+NON_OVERLAPPING_CHANNELS = [1, 6, 11]
+NON_OVERLAPPING_ARRAY = np.array(NON_OVERLAPPING_CHANNELS, dtype=np.int16)
+
+# Canal no superpuesto más cercano para los canales 0..14 de 2.4 GHz; los
+# canales mayores (5 GHz) quedan acotados al último índice, que apunta al 11
+CLOSEST_NON_OVERLAP = np.array(
+    [min(NON_OVERLAPPING_CHANNELS, key=lambda x: abs(x - channel)) for channel in range(15)],
+    dtype=np.int16,
+)
+
+# Tabla de traducción que elimina los caracteres de control ASCII de los SSID
+SSID_CONTROL_CHARS = str.maketrans('', '', ''.join(chr(c) for c in range(32)))
+
+# Umbral (dBm) a partir del cual una red se considera de señal débil
+WEAK_SIGNAL_THRESHOLD = -80
+
+# Umbrales de calidad de señal (dBm): cada intervalo incluye su límite inferior
+SIGNAL_BINS = [-np.inf, -80, -70, -60, -50, np.inf]
+SIGNAL_LABELS = ['Muy débil', 'Débil', 'Regular', 'Buena', 'Excelente']
 
 def robust_csv_loader(csv_file):
     """
@@ -13,18 +57,25 @@ def robust_csv_loader(csv_file):
     """
     print(f"Cargando archivo CSV: {csv_file}")
     
+    # El archivo se lee del disco una sola vez; cada estrategia parsea desde memoria
+    raw = Path(csv_file).read_bytes()
+    
     strategies = [
-        # Estrategia 1: Carga directa
-        lambda: pd.read_csv(csv_file, skiprows=1),
+        # Estrategia 1: Carga con pyarrow (columnas Arrow nativas); este motor
+        # ignora skiprows cuando hay encabezado, por eso se indica con header=1
+        lambda: pd.read_csv(BytesIO(raw), header=1, engine='pyarrow', dtype_backend='pyarrow'),
         
-        # Estrategia 2: Carga omitiendo líneas problemáticas
-        lambda: pd.read_csv(csv_file, skiprows=1, on_bad_lines='skip', engine='python'),
+        # Estrategia 2: Carga directa (tipos compactos si los datos los admiten)
+        lambda: compact_csv_loader(raw),
         
-        # Estrategia 3: Carga como texto y luego limpia
-        lambda: pd.read_csv(csv_file, skiprows=1, dtype=str, on_bad_lines='skip'),
+        # Estrategia 3: Carga omitiendo líneas problemáticas
+        lambda: pd.read_csv(BytesIO(raw), skiprows=1, on_bad_lines='skip', engine='python'),
         
-        # Estrategia 4: Carga con delimitador flexible
-        lambda: pd.read_csv(csv_file, skiprows=1, sep=None, engine='python'),
+        # Estrategia 4: Carga como texto y luego limpia
+        lambda: pd.read_csv(BytesIO(raw), skiprows=1, dtype=str, on_bad_lines='skip'),
+        
+        # Estrategia 5: Carga con delimitador flexible
+        lambda: pd.read_csv(BytesIO(raw), skiprows=1, sep=None, engine='python'),
     ]
     
     for i, strategy in enumerate(strategies):
@@ -33,24 +84,95 @@ def robust_csv_loader(csv_file):
             df = strategy()
             print(f"    Estrategia {i+1} exitosa - {len(df)} filas cargadas")
             return df
-        except Exception as e:
+        except CSV_PARSE_ERRORS as e:
             print(f"    Estrategia {i+1} falló: {e}")
             continue
     
-    # Estrategia 5: Carga manual línea por línea
+    # Estrategia 6: Carga manual línea por línea
     print("    Intentando carga manual línea por línea...")
     try:
-        return manual_csv_loader(csv_file)
-    except Exception as e:
+        return manual_csv_loader(raw)
+    except CSV_PARSE_ERRORS as e:
         print(f"    Carga manual falló: {e}")
     
     return None
 
-def manual_csv_loader(csv_file):
+def compact_csv_loader(raw):
+    """
+    Carga directa con el motor C y los tipos compactos de CSV_DTYPES; si algún
+    valor no admite esos tipos se repite sin ellos. Los errores de tokenización
+    no se reintentan: volver a parsear igual fallaría de la misma forma
+    """
+    try:
+        return pd.read_csv(BytesIO(raw), skiprows=1, engine='c', dtype=CSV_DTYPES)
+    except (pd.errors.ParserError, UnicodeDecodeError):
+        raise
+    except (ValueError, TypeError) as e:
+        print(f"    Tipos compactos no aplicables ({e}); se carga sin ellos")
+        return pd.read_csv(BytesIO(raw), skiprows=1, engine='c')
+
+def arrow_csv_loader(raw):
+    """
+    Carga el contenido CSV con el lector de pyarrow y repara las filas con un
+    número incorrecto de campos (truncando o rellenando con nulos)
+    """
+    head = raw.split(b'\n', 2)  # Metadatos, encabezados y resto
+    if len(head) < 2:
+        raise ValueError("Archivo demasiado corto")
+    headers = head[1].decode('utf-8', errors='ignore').strip().split(',')
+    expected_columns = len(headers)
+    
+    print(f"   Encabezados detectados: {expected_columns} columnas")
+    
+    # Las filas inválidas se apartan durante la lectura, con su número de fila,
+    # y se reparan al final
+    invalid_rows = []
+    
+    def handle_invalid_row(row):
+        invalid_rows.append((row.number, row.text))
+        return 'skip'
+    
+    # row.number solo se conoce leyendo en un único hilo
+    table = pacsv.read_csv(
+        BytesIO(raw),
+        read_options=pacsv.ReadOptions(skip_rows=2, column_names=headers, use_threads=False),
+        parse_options=pacsv.ParseOptions(delimiter=',', invalid_row_handler=handle_invalid_row),
+        convert_options=pacsv.ConvertOptions(column_types={header: pa.string() for header in headers}),
+    )
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    
+    if invalid_rows:
+        if any(number is None for number, _ in invalid_rows):
+            raise ValueError("No se conoce la posición de las filas inválidas")
+        
+        # row.number cuenta desde 1 e incluye metadatos y encabezados
+        positions = [number - 3 for number, _ in invalid_rows]
+        repaired = []
+        for _, text in invalid_rows:
+            fields = text.strip().split(',')[:expected_columns]
+            repaired.append(fields + [None] * (expected_columns - len(fields)))
+        
+        # Cada fila reparada vuelve a su posición original, con columnas Arrow
+        repaired_df = pd.DataFrame(repaired, columns=headers, index=positions,
+                                   dtype=pd.ArrowDtype(pa.string()))
+        df.index = np.delete(np.arange(len(df) + len(positions)), positions)
+        df = pd.concat([df, repaired_df]).sort_index(kind='stable').reset_index(drop=True)
+        print(f"     Líneas problemáticas corregidas: {len(invalid_rows)}")
+    
+    return df
+
+def manual_csv_loader(raw):
     """
-    Carga el CSV manualmente, línea por línea, para manejar inconsistencias
+    Carga el contenido CSV manualmente, línea por línea, para manejar inconsistencias
     """
-    with open(csv_file, 'r', encoding='utf-8', errors='ignore') as f:
+    # Ruta rápida: tokenizador C++ multihilo de pyarrow
+    if pacsv is not None:
+        try:
+            return arrow_csv_loader(raw)
+        except (pa.ArrowException, ValueError) as e:
+            print(f"    Lector pyarrow falló: {e}")
+    
+    with TextIOWrapper(BytesIO(raw), encoding='utf-8', errors='ignore') as f:
         lines = f.readlines()
     
     # Encontrar encabezados
@@ -63,31 +185,26 @@ def manual_csv_loader(csv_file):
     print(f"   Encabezados detectados: {expected_columns} columnas")
     print(f"   Líneas totales: {len(lines)}")
     
-    # Procesar datos
-    data = []
-    problematic_lines = 0
+    # Procesar datos (desde la línea 3, después de metadatos y encabezados).
+    # maxsplit limita las filas largas a expected_columns + 1 campos: el
+    # sobrante queda en el último y se descarta, sin partir el resto
+    data = [line.strip().split(',', expected_columns) for line in islice(lines, 2, None)]
     
-    for i, line in enumerate(lines[2:], start=3):  # Empezar desde línea 3 (después de metadatos y encabezados)
-        fields = line.strip().split(',')
-        
-        if len(fields) == expected_columns:
-            data.append(fields)
-        elif len(fields) > expected_columns:
-            # Demasiados campos - truncar
-            data.append(fields[:expected_columns])
-            problematic_lines += 1
-        elif len(fields) < expected_columns:
-            # Muy pocos campos - rellenar con NaN
-            padded_fields = fields + [np.nan] * (expected_columns - len(fields))
-            data.append(padded_fields)
-            problematic_lines += 1
-        else:
-            problematic_lines += 1
+    # Longitudes de todas las filas en un solo arreglo para detectar las problemáticas
+    lengths = np.fromiter(map(len, data), dtype=np.int32, count=len(data))
+    problematic_lines = int(np.count_nonzero(lengths != expected_columns))
     
     if problematic_lines > 0:
         print(f"     Líneas problemáticas corregidas: {problematic_lines}")
     
-    df = pd.DataFrame(data, columns=headers)
+    if problematic_lines == 0:
+        # Caso habitual: todas las filas completas, un único arreglo 2-D sin copias
+        return pd.DataFrame(np.asarray(data, dtype=object).reshape(-1, expected_columns), columns=headers, copy=False)
+    
+    # pandas rellena con nulos las filas cortas al construir el DataFrame;
+    # reindex descarta los campos sobrantes de las filas largas
+    df = pd.DataFrame(data).reindex(columns=range(expected_columns))
+    df.columns = headers
     return df
 
 def clean_and_validate_data(df):
@@ -107,28 +224,45 @@ def clean_and_validate_data(df):
         print(f"     Columnas faltantes: {missing_columns}")
         print(f"    Columnas disponibles: {list(df.columns)}")
     
-    # Limpiar columnas numéricas críticas
-    if 'RSSI' in df.columns:
-        df['RSSI'] = pd.to_numeric(df['RSSI'], errors='coerce')
-        rssi_nulos = df['RSSI'].isna().sum()
-        if rssi_nulos > 0:
-            print(f"     Valores RSSI no numéricos eliminados: {rssi_nulos}")
-    
-    if 'Channel' in df.columns:
-        df['Channel'] = pd.to_numeric(df['Channel'], errors='coerce')
-        channel_nulos = df['Channel'].isna().sum()
-        if channel_nulos > 0:
-            print(f"     Valores Channel no numéricos eliminados: {channel_nulos}")
-    
-    # Eliminar filas sin datos críticos
+    # Convertir las columnas numéricas críticas una sola vez: las mismas
+    # máscaras dan los conteos de nulos y el filtro final de filas
+    rssi_num = pd.to_numeric(df['RSSI'], errors='coerce')
+    channel_num = pd.to_numeric(df['Channel'], errors='coerce')
+    rssi_valid = rssi_num.notna()
+    channel_valid = channel_num.notna() & (channel_num >= 0)
+    
+    rssi_nulos = len(df) - int(rssi_valid.sum())
+    if rssi_nulos > 0:
+        print(f"     Valores RSSI no numéricos eliminados: {rssi_nulos}")
+    
+    channel_nulos = len(df) - int(channel_valid.sum())
+    if channel_nulos > 0:
+        print(f"     Valores Channel no numéricos o negativos eliminados: {channel_nulos}")
+    
+    # Eliminar filas sin datos críticos. Canal como entero compacto para los
+    # conteos con np.bincount (int16 y no int8: los canales de 5 GHz llegan
+    # hasta 196) y RSSI en float32, la mitad de tráfico de memoria en cada
+    # pasada sobre la columna
+    keep = rssi_valid & channel_valid
     initial_rows = len(df)
-    df = df.dropna(subset=['RSSI', 'Channel'])
+    df = df.loc[keep].assign(
+        RSSI=rssi_num[keep].astype(np.float32),
+        Channel=channel_num[keep].astype(np.int16),
+    )
     final_rows = len(df)
     removed_rows = initial_rows - final_rows
     
     if removed_rows > 0:
         print(f"   🗑️  Filas sin datos críticos eliminadas: {removed_rows}")
     
+    # SSID como categoría: value_counts/groupby trabajan sobre códigos enteros.
+    # Los caracteres de control se eliminan una vez por SSID distinto, no por fila
+    if 'SSID' in df.columns:
+        ssid = df['SSID'].astype('category')
+        if ssid.cat.categories.inferred_type == 'string':
+            ssid = ssid.map(lambda value: value.translate(SSID_CONTROL_CHARS), na_action='ignore').astype('category')
+        df = df.assign(SSID=ssid)
+    
     print(f"    Forma final: {df.shape[0]} filas, {df.shape[1]} columnas")
     return df
 
@@ -138,30 +272,77 @@ def format_channels_list(channels):
     """
     return [int(channel) for channel in channels]
 
-def generate_comprehensive_analysis(df, csv_file):
+def find_overlapping_channels(channel_counts):
     """
-    Genera un análisis completo e interpretado de los datos
+    Lista los canales que interfieren con los no superpuestos como tuplas
+    (canal, canal no superpuesto más cercano, distancia, número de redes)
     """
-    analysis = "\n" + "="*60 + "\n"
-    analysis += " RESUMEN EJECUTIVO DEL ANÁLISIS\n"
-    analysis += "="*60 + "\n\n"
+    channels = channel_counts.index.to_numpy()
+    problematic = np.setdiff1d(channels, NON_OVERLAPPING_ARRAY, assume_unique=True)
+    
+    # Canal no superpuesto más cercano según la tabla (canales > 14 acotados)
+    closest = CLOSEST_NON_OVERLAP[np.clip(problematic, 0, 14)]
+    distances = np.abs(problematic - closest)
+    counts = channel_counts.loc[problematic].to_numpy()
+    
+    # Convertir a enteros Python normales para la salida
+    return list(zip(problematic.tolist(), closest.tolist(), distances.tolist(), counts.tolist()))
+
+def compute_stats(df):
+    """
+    Calcula en una sola pasada las estadísticas que consumen la salida por
+    consola, las gráficas y el reporte
+    """
+    # Máscara de señal débil: una sola pasada sobre el arreglo de RSSI
+    rssi = df['RSSI'].to_numpy()
+    weak_mask = rssi <= WEAK_SIGNAL_THRESHOLD
+    
+    # Conteos y sumas de RSSI por canal con np.bincount sobre el arreglo de canales
+    channels = df['Channel'].to_numpy()
+    counts = np.bincount(channels, minlength=15)
+    rssi_sums = np.bincount(channels, weights=rssi, minlength=15)
+    present = np.flatnonzero(counts)
+    channel_counts = pd.Series(counts[present], index=present)
+    rssi_by_channel = pd.DataFrame(
+        {'mean': (rssi_sums[present] / counts[present]).round(1), 'count': counts[present]},
+        index=present,
+    )
+    
+    return {
+        'total_networks': len(df),
+        'channel_counts': channel_counts,
+        'rssi_by_channel': rssi_by_channel,
+        'weak_count': int(weak_mask.sum()),
+        'weak_top10': df.loc[weak_mask, ['SSID', 'Channel', 'RSSI']].nsmallest(10, 'RSSI'),
+        'overlapping_issues': find_overlapping_channels(channel_counts),
+    }
+
+def generate_comprehensive_analysis(stats):
+    """
+    Genera un análisis completo e interpretado a partir de las estadísticas
+    calculadas por compute_stats
+    """
+    channel_counts = stats['channel_counts']
+    weak_count = stats['weak_count']
+    
+    buf = StringIO()
+    w = buf.write
+    w("\n" + "="*60 + "\n")
+    w(" RESUMEN EJECUTIVO DEL ANÁLISIS\n")
+    w("="*60 + "\n\n")
     
     # Hallazgos principales
-    total_networks = len(df)
-    weak_networks = len(df[df['RSSI'] <= -80])
-    weak_percentage = (weak_networks / total_networks) * 100
+    total_networks = stats['total_networks']
+    weak_percentage = (weak_count / total_networks) * 100
     
-    analysis += " HALLAZGOS PRINCIPALES:\n"
-    analysis += f"   • Total de redes detectadas: {total_networks:,} redes\n"
-    analysis += f"   • Redes con señal débil: {weak_networks:,} redes ({weak_percentage:.1f}% del total)\n"
-    analysis += f"   • Canales utilizados: {len(df['Channel'].unique())} canales diferentes\n\n"
+    w(" HALLAZGOS PRINCIPALES:\n")
+    w(f"   • Total de redes detectadas: {total_networks:,} redes\n")
+    w(f"   • Redes con señal débil: {weak_count:,} redes ({weak_percentage:.1f}% del total)\n")
+    w(f"   • Canales utilizados: {len(channel_counts)} canales diferentes\n\n")
     
     # Análisis de canales no superpuestos
-    non_overlapping = [1, 6, 11]
-    channel_counts = df['Channel'].value_counts()
-    
-    analysis += " SITUACIÓN DE CANALES NO SUPERPUESTOS:\n"
-    for channel in non_overlapping:
+    w(" SITUACIÓN DE CANALES NO SUPERPUESTOS:\n")
+    for channel in NON_OVERLAPPING_CHANNELS:
         count = channel_counts.get(channel, 0)
         status = ""
         if count > 400:
@@ -174,64 +355,56 @@ def generate_comprehensive_analysis(df, csv_file):
             status = " (Moderado)"
         else:
             status = " (Óptimo)"
-        analysis += f"   • Canal {channel}: {count:,} redes {status}\n"
+        w(f"   • Canal {channel}: {count:,} redes {status}\n")
     
     # Canales problemáticos
-    analysis += "\n  CANALES PROBLEMÁTICOS (INTERFERENCIA):\n"
-    overlapping_issues = []
-    for channel in df['Channel'].unique():
-        channel_int = int(channel)  # Convertir a entero normal
-        if channel_int not in non_overlapping:
-            closest_non_overlap = min(non_overlapping, key=lambda x: abs(x - channel_int))
-            count = len(df[df['Channel'] == channel])
-            overlapping_issues.append((channel_int, closest_non_overlap, count))
-    
+    w("\n  CANALES PROBLEMÁTICOS (INTERFERENCIA):\n")
     # Ordenar por cantidad de redes (más problemáticos primero)
-    overlapping_issues.sort(key=lambda x: x[2], reverse=True)
+    most_problematic = sorted(stats['overlapping_issues'], key=lambda x: x[3], reverse=True)
     
-    for channel, closest, count in overlapping_issues[:6]:  # Top 6 más problemáticos
-        analysis += f"   • Canal {channel}: {count:,} redes (interfiere con canal {closest})\n"
+    for channel, closest, _, count in most_problematic[:6]:  # Top 6 más problemáticos
+        w(f"   • Canal {channel}: {count:,} redes (interfiere con canal {closest})\n")
     
     # Recomendaciones estratégicas
-    analysis += "\n" + "="*60 + "\n"
-    analysis += " RECOMENDACIONES ESTRATÉGICAS\n"
-    analysis += "="*60 + "\n\n"
-    
-    analysis += " PROBLEMAS CRÍTICOS IDENTIFICADOS:\n"
-    analysis += "   1. Canal 11 saturado - Evitar completamente\n"
-    analysis += "   2. Todos los canales no superpuestos están congestionados\n"
-    analysis += "   3. Alta densidad de redes en ambiente 2.4GHz\n\n"
-    
-    analysis += " ESTRATEGIAS RECOMENDADAS:\n"
-    analysis += "   1. MIGRACIÓN A 5GHz:\n"
-    analysis += "      • Configurar redes en banda 5GHz si los dispositivos lo soportan\n"
-    analysis += "      • Menor interferencia y más canales disponibles\n\n"
-    
-    analysis += "   2. CANALES ALTERNATIVOS EN 2.4GHz:\n"
-    analysis += "      • Canal 13: {} redes (menos congestionado)\n".format(channel_counts.get(13, 0))
-    analysis += "      • Canal 14: {} redes (menos congestionado)\n".format(channel_counts.get(14, 0))
-    analysis += "      • Canal 5: {} redes (muy poco congestionado)\n\n".format(channel_counts.get(5, 0))
-    
-    analysis += "   3. OPTIMIZACIÓN DE 2.4GHz:\n"
-    analysis += "      • Usar ancho de canal de 20MHz (no 40MHz)\n"
-    analysis += "      • Transmitir en potencia baja para no afectar redes vecinas\n"
-    analysis += "      • Programar reinicios nocturnos del router\n\n"
-    
-    analysis += "   4. PARA REDES CRÍTICAS:\n"
-    analysis += "      • Implementar calidad de servicio (QoS)\n"
-    analysis += "      • Usar banda dual (2.4GHz para IoT, 5GHz para dispositivos principales)\n\n"
-    
-    analysis += " PARA USUARIOS FINALES:\n"
-    analysis += "   • Conectar dispositivos importantes a 5GHz cuando sea posible\n"
-    analysis += "   • Ubicar el router lejos de interferencias (microondas, teléfonos inalámbricos)\n"
-    analysis += "   • Considerar sistemas mesh para mejor cobertura\n\n"
-    
-    analysis += " PERSPECTIVA:\n"
-    analysis += "   El entorno analizado muestra una SATURACIÓN SEVERA de la banda 2.4GHz,\n"
-    analysis += "   típica de áreas urbanas densas. La migración a 5GHz no es solo recomendable,\n"
-    analysis += "   sino necesaria para obtener rendimiento adecuado.\n"
-    
-    return analysis
+    w("\n" + "="*60 + "\n")
+    w(" RECOMENDACIONES ESTRATÉGICAS\n")
+    w("="*60 + "\n\n")
+    
+    w(" PROBLEMAS CRÍTICOS IDENTIFICADOS:\n")
+    w("   1. Canal 11 saturado - Evitar completamente\n")
+    w("   2. Todos los canales no superpuestos están congestionados\n")
+    w("   3. Alta densidad de redes en ambiente 2.4GHz\n\n")
+    
+    w(" ESTRATEGIAS RECOMENDADAS:\n")
+    w("   1. MIGRACIÓN A 5GHz:\n")
+    w("      • Configurar redes en banda 5GHz si los dispositivos lo soportan\n")
+    w("      • Menor interferencia y más canales disponibles\n\n")
+    
+    w("   2. CANALES ALTERNATIVOS EN 2.4GHz:\n")
+    w("      • Canal 13: {} redes (menos congestionado)\n".format(channel_counts.get(13, 0)))
+    w("      • Canal 14: {} redes (menos congestionado)\n".format(channel_counts.get(14, 0)))
+    w("      • Canal 5: {} redes (muy poco congestionado)\n\n".format(channel_counts.get(5, 0)))
+    
+    w("   3. OPTIMIZACIÓN DE 2.4GHz:\n")
+    w("      • Usar ancho de canal de 20MHz (no 40MHz)\n")
+    w("      • Transmitir en potencia baja para no afectar redes vecinas\n")
+    w("      • Programar reinicios nocturnos del router\n\n")
+    
+    w("   4. PARA REDES CRÍTICAS:\n")
+    w("      • Implementar calidad de servicio (QoS)\n")
+    w("      • Usar banda dual (2.4GHz para IoT, 5GHz para dispositivos principales)\n\n")
+    
+    w(" PARA USUARIOS FINALES:\n")
+    w("   • Conectar dispositivos importantes a 5GHz cuando sea posible\n")
+    w("   • Ubicar el router lejos de interferencias (microondas, teléfonos inalámbricos)\n")
+    w("   • Considerar sistemas mesh para mejor cobertura\n\n")
+    
+    w(" PERSPECTIVA:\n")
+    w("   El entorno analizado muestra una SATURACIÓN SEVERA de la banda 2.4GHz,\n")
+    w("   típica de áreas urbanas densas. La migración a 5GHz no es solo recomendable,\n")
+    w("   sino necesaria para obtener rendimiento adecuado.\n")
+    
+    return buf.getvalue()
 
 def analyze_wifi_interference(csv_file):
     try:
@@ -259,20 +432,15 @@ def analyze_wifi_interference(csv_file):
         print(f" Error al procesar el archivo: {e}")
         return None
     
-    # Función para clasificar la calidad de señal
-    def classify_signal(rssi):
-        if rssi >= -50:
-            return "Excelente"
-        elif rssi >= -60:
-            return "Buena"
-        elif rssi >= -70:
-            return "Regular"
-        elif rssi >= -80:
-            return "Débil"
-        else:
-            return "Muy débil"
+    # Clasificar la calidad de señal en una sola pasada vectorizada
+    df['Calidad'] = pd.cut(df['RSSI'], bins=SIGNAL_BINS, labels=SIGNAL_LABELS, right=False)
     
-    df['Calidad'] = df['RSSI'].apply(classify_signal)
+    # Todas las estadísticas se calculan una sola vez; la salida por consola,
+    # las gráficas y el reporte solo las formatean
+    stats = compute_stats(df)
+    channel_counts = stats['channel_counts']
+    rssi_by_channel = stats['rssi_by_channel']
+    weak_count = stats['weak_count']
     
     print("\n" + "="*50)
     print("ANÁLISIS DE INTERFERENCIAS WiFi")
@@ -280,7 +448,7 @@ def analyze_wifi_interference(csv_file):
     
     # 1. Análisis general de redes
     print("\n1.  RESUMEN GENERAL DE REDES DETECTADAS:")
-    print(f"   - Total de redes detectadas: {len(df)}")
+    print(f"   - Total de redes detectadas: {stats['total_networks']}")
     print(f"   - Redes únicas por SSID: {df['SSID'].nunique()}")
     
     # Verificar si existe la columna FirstSeen y tiene datos válidos
@@ -295,49 +463,35 @@ def analyze_wifi_interference(csv_file):
     
     # 2. Análisis por canal
     print("\n2.  DISTRIBUCIÓN POR CANAL:")
-    channel_dist = df['Channel'].value_counts().sort_index()
-    for channel, count in channel_dist.items():
+    for channel, count in channel_counts.sort_index().items():
         print(f"   - Canal {int(channel)}: {count} redes")
     
     # 3. Análisis de interferencias por canal
     print("\n3.   ANÁLISIS DE INTERFERENCIAS POR CANAL:")
     
     # Canales no superpuestos en 2.4 GHz: 1, 6, 11
-    non_overlapping = [1, 6, 11]
-    overlapping_issues = []
-    
-    for channel in df['Channel'].unique():
-        channel_int = int(channel)  # Convertir a entero normal
-        if channel_int not in non_overlapping:
-            # Determinar qué canales no superpuestos están más cerca
-            closest_non_overlap = min(non_overlapping, key=lambda x: abs(x - channel_int))
-            overlapping_issues.append((channel_int, closest_non_overlap, abs(channel_int - closest_non_overlap)))
-    
-    if overlapping_issues:
+    if stats['overlapping_issues']:
         print("    Se detectaron redes en canales que causan interferencia:")
-        for channel, closest, distance in overlapping_issues:
-            count = len(df[df['Channel'] == channel])
+        for channel, closest, distance, count in stats['overlapping_issues']:
             print(f"     - Canal {channel}: {count} redes (interfiere con canal {closest}, distancia: {distance})")
     else:
         print("    Todas las redes están en canales no superpuestos (1, 6, 11)")
     
     # 4. Análisis de intensidad de señal por canal
     print("\n4.  INTENSIDAD DE SEÑAL POR CANAL (RSSI promedio):")
-    rssi_by_channel = df.groupby('Channel')['RSSI'].agg(['mean', 'count']).round(1)
     for channel, data in rssi_by_channel.iterrows():
         print(f"   - Canal {int(channel)}: {data['mean']} dBm ({int(data['count'])} redes)")
     
     # 5. Detección de redes con posible interferencia
     print("\n5.  REDES CON POSIBLE INTERFERENCIA:")
-    interference_threshold = -80
-    weak_networks = df[df['RSSI'] <= interference_threshold]
-    
-    if len(weak_networks) > 0:
-        print(f"    Se detectaron {len(weak_networks)} redes con señal débil (RSSI <= {interference_threshold} dBm):")
-        for _, row in weak_networks.head(10).iterrows():  # Mostrar solo las primeras 10
-            print(f"     - {row['SSID']} (Canal {int(row['Channel'])}, RSSI: {row['RSSI']} dBm)")
-        if len(weak_networks) > 10:
-            print(f"     ... y {len(weak_networks) - 10} redes más")
+    if weak_count > 0:
+        print(f"    Se detectaron {weak_count} redes con señal débil (RSSI <= {WEAK_SIGNAL_THRESHOLD} dBm):")
+        # Mostrar solo las 10 más débiles, iterando arreglos en lugar de filas
+        top_weak = stats['weak_top10']
+        for ssid, channel, rssi in zip(top_weak['SSID'].to_numpy(), top_weak['Channel'].to_numpy(), top_weak['RSSI'].to_numpy()):
+            print(f"     - {ssid} (Canal {int(channel)}, RSSI: {rssi:g} dBm)")
+        if weak_count > 10:
+            print(f"     ... y {weak_count - 10} redes más")
     else:
         print("    No se detectaron redes con señal extremadamente débil")
     
@@ -345,7 +499,6 @@ def analyze_wifi_interference(csv_file):
     print("\n6.  RECOMENDACIONES:")
     
     # Verificar si hay canales congestionados
-    channel_counts = df['Channel'].value_counts()
     if not channel_counts.empty:
         most_congested = int(channel_counts.idxmax())  # Convertir a entero normal
         least_congested = int(channel_counts.idxmin())  # Convertir a entero normal
@@ -355,8 +508,8 @@ def analyze_wifi_interference(csv_file):
         
         # Sugerir canales óptimos
         optimal_channels = []
-        for channel in non_overlapping:
-            if channel not in df['Channel'].values or channel_counts.get(channel, 0) < 2:
+        for channel in NON_OVERLAPPING_CHANNELS:
+            if channel_counts.get(channel, 0) < 2:
                 optimal_channels.append(channel)
         
         if optimal_channels:
@@ -370,33 +523,36 @@ def analyze_wifi_interference(csv_file):
     print("\n7.  GENERANDO VISUALIZACIONES...")
     
     try:
-        # Configurar el estilo de las gráficas
-        plt.style.use('default')
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        # El layout 'constrained' evita el recálculo de bbox_inches='tight' al guardar
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12), layout='constrained')
         fig.suptitle(f'Análisis de Interferencias WiFi - {csv_file}', fontsize=16)
         
+        # Etiquetas de canal calculadas una vez para las dos gráficas por canal
+        channel_dist = channel_counts.sort_index()
+        channel_labels = [str(int(channel)) for channel in channel_dist.index]
+        
         # Gráfica 1: Distribución de redes por canal
-        channel_counts = df['Channel'].value_counts().sort_index()
-        axes[0, 0].bar(channel_counts.index.astype(str), channel_counts.values, color='skyblue')
+        axes[0, 0].bar(channel_labels, channel_dist.values, color='skyblue')
         axes[0, 0].set_title('Distribución de Redes por Canal')
         axes[0, 0].set_xlabel('Canal')
         axes[0, 0].set_ylabel('Número de Redes')
         
         # Gráfica 2: Intensidad de señal por canal
-        channel_rssi = df.groupby('Channel')['RSSI'].mean()
-        axes[0, 1].bar(channel_rssi.index.astype(str), channel_rssi.values, color='lightcoral')
+        axes[0, 1].bar(channel_labels, rssi_by_channel['mean'].values, color='lightcoral')
         axes[0, 1].set_title('Intensidad Promedio de Señal por Canal')
         axes[0, 1].set_xlabel('Canal')
         axes[0, 1].set_ylabel('RSSI Promedio (dBm)')
         
         # Gráfica 3: Calidad de señal
         quality_counts = df['Calidad'].value_counts()
+        quality_counts = quality_counts[quality_counts > 0]
         colors = ['#4CAF50', '#8BC34A', '#FFC107', '#FF9800', '#F44336']
         axes[1, 0].pie(quality_counts.values, labels=quality_counts.index, autopct='%1.1f%%', colors=colors)
         axes[1, 0].set_title('Distribución de Calidad de Señal')
         
         # Gráfica 4: Top SSIDs
-        ssid_counts = df['SSID'].value_counts().head(8)
+        # Selección parcial del top 8 en lugar de ordenar todos los SSID distintos
+        ssid_counts = df['SSID'].value_counts(sort=False).nlargest(8)
         axes[1, 1].bar(range(len(ssid_counts)), ssid_counts.values, color='mediumpurple')
         axes[1, 1].set_title('Redes por SSID (Top 8)')
         axes[1, 1].set_xlabel('SSID')
@@ -404,9 +560,9 @@ def analyze_wifi_interference(csv_file):
         axes[1, 1].set_xticks(range(len(ssid_counts)))
         axes[1, 1].set_xticklabels(ssid_counts.index, rotation=45, ha='right')
         
-        plt.tight_layout()
         output_image = csv_file.replace('.csv', '_analysis.png')
-        plt.savefig(output_image, dpi=300, bbox_inches='tight')
+        fig.savefig(output_image, dpi=120)
+        plt.close(fig)
         print(f"    Gráficas guardadas como '{output_image}'")
         
     except Exception as e:
@@ -415,26 +571,29 @@ def analyze_wifi_interference(csv_file):
     # Guardar resultados en un archivo de texto CON ANÁLISIS COMPLETO
     try:
         output_report = csv_file.replace('.csv', '_report.txt')
-        with open(output_report, 'w', encoding='utf-8') as f:
-            f.write("ANÁLISIS DE INTERFERENCIAS WiFi\n")
-            f.write("="*50 + "\n\n")
-            f.write(f"Archivo analizado: {csv_file}\n")
-            f.write(f"Redes analizadas: {len(df)}\n")
-            
-            # CORRECCIÓN: Convertir canales a enteros normales
-            canales_detectados = format_channels_list(df['Channel'].unique())
-            f.write(f"Canales detectados: {sorted(canales_detectados)}\n")
-            
-            weak_signals = len(df[df['RSSI'] <= -80])
-            f.write(f"Redes con señal débil (RSSI <= -80 dBm): {weak_signals}\n")
-            
-            f.write("\nDistribución por canal:\n")
-            for channel, count in df['Channel'].value_counts().sort_index().items():
-                f.write(f"- Canal {int(channel)}: {count} redes\n")
-            
-            # Agregar el análisis completo e interpretado
-            comprehensive_analysis = generate_comprehensive_analysis(df, csv_file)
-            f.write(comprehensive_analysis)
+        report = StringIO()
+        w = report.write
+        w("ANÁLISIS DE INTERFERENCIAS WiFi\n")
+        w("="*50 + "\n\n")
+        w(f"Archivo analizado: {csv_file}\n")
+        w(f"Redes analizadas: {stats['total_networks']}\n")
+        
+        # CORRECCIÓN: Convertir canales a enteros normales
+        canales_detectados = format_channels_list(channel_counts.index)
+        w(f"Canales detectados: {sorted(canales_detectados)}\n")
+        
+        w(f"Redes con señal débil (RSSI <= {WEAK_SIGNAL_THRESHOLD} dBm): {weak_count}\n")
+        
+        w("\nDistribución por canal:\n")
+        for channel, count in channel_counts.sort_index().items():
+            w(f"- Canal {int(channel)}: {count} redes\n")
+        
+        # Agregar el análisis completo e interpretado
+        w(generate_comprehensive_analysis(stats))
+        
+        # Codificar el reporte completo una sola vez y escribirlo en una única llamada
+        with open(output_report, 'wb') as f:
+            f.write(report.getvalue().encode('utf-8'))
         
         print(f"    Reporte completo guardado como '{output_report}'")
         
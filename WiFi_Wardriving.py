@@ -9,14 +9,24 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import folium
-from folium.plugins import HeatMap
+from folium.plugins import HeatMap, FastMarkerCluster
 import argparse
 import sys
 import os
 from datetime import datetime
 import warnings
 import csv
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+    from pyarrow import parquet as pq
+except ImportError:  # pyarrow es opcional: sin él se usa el motor de Python
+    pa = None
+    pacsv = None
+    pq = None
 
 # Configuración de estilo y warnings
 plt.style.use('default')
@@ -24,93 +34,219 @@ sns.set_palette("husl")
 warnings.filterwarnings("ignore", category=UserWarning, module="folium")
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+# Tipos de las columnas numéricas y de fecha para el lector de pyarrow
+if pa is not None:
+    PYARROW_COLUMN_TYPES = {
+        'Channel': pa.int16(),
+        'Frequency': pa.int16(),
+        'RSSI': pa.int8(),
+        'CurrentLatitude': pa.float64(),
+        'CurrentLongitude': pa.float64(),
+        'FirstSeen': pa.timestamp('s'),
+    }
+
+# Columnas que necesita el análisis; son las que se guardan en la caché Parquet
+COLUMNAS_REQUERIDAS = ['SSID', 'FirstSeen', 'Channel', 'Frequency', 'RSSI',
+                       'CurrentLatitude', 'CurrentLongitude', 'AuthMode']
+COLUMNAS_CACHE = COLUMNAS_REQUERIDAS + ['Timestamp']
+
+# Clave de los metadatos Parquet con el tamaño y la fecha del CSV de origen
+CLAVE_FIRMA_CACHE = b'wardriving_firma_csv'
+
+# Formato de fecha de FirstSeen en los CSV de Wigle
+FORMATO_FECHA_WIGLE = '%Y-%m-%d %H:%M:%S'
+
+# Nombres alternativos comunes de cada columna requerida, en orden de preferencia
+MAPEO_COLUMNAS = {
+    'SSID': ['SSID', 'ssid', 'Ssid'],
+    'FirstSeen': ['FirstSeen', 'First seen', 'firstseen', 'Timestamp'],
+    'Channel': ['Channel', 'channel', 'CH'],
+    'Frequency': ['Frequency', 'frequency', 'Freq'],
+    'RSSI': ['RSSI', 'rssi', 'Signal'],
+    'CurrentLatitude': ['CurrentLatitude', 'Latitude', 'Lat', 'latitude'],
+    'CurrentLongitude': ['CurrentLongitude', 'Longitude', 'Lon', 'longitude'],
+    'AuthMode': ['AuthMode', 'Authentication', 'Encryption', 'auth']
+}
+
+# Lecturas con el motor C: filas por bloque y tipos compactos por columna
+TAMANO_BLOQUE_CSV = 200_000
+TIPOS_CSV = {'Channel': 'Int16', 'Frequency': 'Int16', 'RSSI': 'float32',
+             'CurrentLatitude': 'float64', 'CurrentLongitude': 'float64'}
+
+# A partir de este número de grupos (SSID, ubicación) el mapa usa FastMarkerCluster
+UMBRAL_MARCADORES_AGRUPADOS = 500
+
+# Puntos máximos de la serie temporal tras el diezmado LTTB
+PUNTOS_SERIE_TEMPORAL = 2000
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int = PUNTOS_SERIE_TEMPORAL):
+    """
+    Diezmado Largest-Triangle-Three-Buckets: conserva el primer y último punto
+    y, de cada bucket intermedio, el que forma el triángulo de mayor área con
+    el punto elegido antes y la media del bucket siguiente. x puede ser datetime64.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    
+    xf = (x - x[0]).astype(np.float64)
+    yf = y.astype(np.float64)
+    bordes = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        if i + 2 < len(bordes):
+            media_x = xf[fin:bordes[i + 2]].mean()
+            media_y = yf[fin:bordes[i + 2]].mean()
+        else:
+            media_x, media_y = xf[-1], yf[-1]
+        
+        areas = np.abs((xf[a] - media_x) * (yf[ini:fin] - yf[a])
+                       - (xf[a] - xf[ini:fin]) * (media_y - yf[a]))
+        a = ini + int(np.argmax(areas))
+        indices[i + 1] = a
+    
+    return x[indices], y[indices]
+
+# Bordes de las bandas de calidad (débil | aceptable | buena | excelente); el
+# último queda justo por encima de -65 para que -65 cuente como "buena"
+BORDES_CALIDAD = np.array([-85, -75, np.nextafter(-65, np.inf)])
+
+def _resumir_rssi(rssi: np.ndarray) -> Dict[str, Any]:
+    """
+    Recorre el RSSI una vez y devuelve todo lo que usan reporte, calidad y
+    mapa de calor: intensidad del heatmap, conteos por banda y estadísticas
+    """
+    rssi = rssi.astype(np.float64)
+    validos = ~np.isnan(rssi)
+    
+    # RSSI sin valor se trata con intensidad máxima en el mapa de calor
+    intensidad = np.where(validos, np.clip((rssi + 100.0) / 40.0, 0.1, 1.0), 1.0)
+    
+    datos = rssi[validos]
+    conteos = np.bincount(np.searchsorted(BORDES_CALIDAD, datos, side='right'), minlength=4)
+    
+    if len(datos) == 0:
+        promedio = minimo = maximo = desviacion = np.nan
+    else:
+        promedio = datos.mean()
+        # El RSSI de WiGLE es entero: mínimo y máximo se informan sin decimales
+        minimo = int(datos.min())
+        maximo = int(datos.max())
+        desviacion = datos.std(ddof=1) if len(datos) > 1 else np.nan
+    
+    return {
+        'intensidad': intensidad,
+        'conteos': conteos,
+        'promedio': promedio,
+        'minimo': minimo,
+        'maximo': maximo,
+        'desviacion': desviacion,
+    }
+
 class WardrivingAnalyzer:
     """Clase principal para análisis de datos de wardriving"""
     
     def __init__(self, archivo_csv: str):
         self.archivo_csv = archivo_csv
         self.df = None
+        self._analisis_cache = None
+        self._resumen_rssi_cache = None
         self.nombre_base = os.path.splitext(os.path.basename(archivo_csv))[0]
         
     def cargar_datos(self) -> bool:
         """Carga y prepara los datos del archivo CSV - VERSIÓN CORREGIDA"""
+        self._analisis_cache = None
+        self._resumen_rssi_cache = None
         try:
             if not os.path.exists(self.archivo_csv):
                 print(f" Error: El archivo '{self.archivo_csv}' no existe")
                 return False
             
+            # Caché Parquet junto al CSV: se reutiliza si el CSV no cambió de tamaño ni de fecha
+            pq_path = self.archivo_csv + '.parquet'
+            if self._cargar_cache_parquet(pq_path):
+                return True
+            
+            # Solo se parsean las columnas requeridas (o sus nombres alternativos)
+            columnas, fila_encabezado = self._resolver_columnas()
+            usecols = (lambda col: col in columnas) if columnas else None
+            
             # Primero, intentamos leer el archivo con diferentes configuraciones
             try:
-                # Intento 1: Leer con engine de Python que es más tolerante
-                self.df = pd.read_csv(self.archivo_csv, skiprows=1, engine='python', 
-                                     quoting=csv.QUOTE_MINIMAL, on_bad_lines='warn')
-                print(" Datos cargados con engine de Python")
+                # Intento 1: Lector CSV de pyarrow (multihilo, sin parseo fila a fila)
+                self.df = self._leer_csv_pyarrow(columnas, fila_encabezado)
+                print(" Datos cargados con pyarrow")
             except Exception as e:
-                print(f"  Primer intento falló: {e}")
-                print(" Intentando método alternativo...")
+                print(f"  Lector pyarrow no disponible o falló: {e}")
+                self.df = None
+            
+            if self.df is None:
+                try:
+                    # Intento 2: Motor C por bloques, filtrando filas sin coordenadas en cada bloque
+                    self.df = self._leer_csv_por_bloques(columnas, fila_encabezado)
+                    print(" Datos cargados por bloques con engine C")
+                except Exception as e:
+                    print(f"  Lectura por bloques falló: {e}")
+                    self.df = None
+            
+            if self.df is None:
+                try:
+                    # Intento 3: Leer con engine de Python que es más tolerante
+                    self.df = pd.read_csv(self.archivo_csv, skiprows=fila_encabezado, engine='python', usecols=usecols,
+                                         quoting=csv.QUOTE_MINIMAL, on_bad_lines='warn')
+                    print(" Datos cargados con engine de Python")
+                except Exception as e:
+                    print(f"  Tercer intento falló: {e}")
+                    print(" Intentando método alternativo...")
                 
-                # Intento 2: Leer sin skiprows y luego procesar manualmente
-                temp_df = pd.read_csv(self.archivo_csv, engine='python', 
-                                     quoting=csv.QUOTE_MINIMAL, on_bad_lines='skip')
+                    # Intento 4: Leer sin skiprows y luego procesar manualmente
+                    temp_df = pd.read_csv(self.archivo_csv, engine='python', usecols=usecols,
+                                         quoting=csv.QUOTE_MINIMAL, on_bad_lines='skip')
                 
-                # Si la primera fila parece ser encabezado, la usamos
-                if len(temp_df.columns) > 1 and any('SSID' in str(col) for col in temp_df.columns):
-                    self.df = temp_df
-                    print(" Datos cargados sin skiprows")
-                else:
-                    # Intento 3: Saltar primera fila manualmente
-                    self.df = pd.read_csv(self.archivo_csv, skiprows=1, 
-                                         error_bad_lines=False, warn_bad_lines=True)
-                    print(" Datos cargados con error_bad_lines=False")
+                    # Si la primera fila parece ser encabezado, la usamos
+                    if len(temp_df.columns) > 1 and any('SSID' in str(col) for col in temp_df.columns):
+                        self.df = temp_df
+                        print(" Datos cargados sin skiprows")
+                    else:
+                        # Intento 5: Saltar primera fila manualmente
+                        self.df = pd.read_csv(self.archivo_csv, skiprows=fila_encabezado, dtype=TIPOS_CSV,
+                                             usecols=usecols, memory_map=True, low_memory=False,
+                                             on_bad_lines='warn')
+                        print(" Datos cargados con engine C (memory_map)")
             
             if self.df is None or self.df.empty:
                 print(" No se pudieron cargar datos válidos")
                 return False
             
-            # Limpiar nombres de columnas (eliminar espacios extra, etc.)
+            # Pasar a los nombres requeridos y limpiar los demás (eliminar espacios extra, etc.)
+            self.df = self.df.rename(columns=columnas)
             self.df.columns = self.df.columns.str.strip()
             
             # Verificar columnas requeridas
-            columnas_requeridas = ['SSID', 'FirstSeen', 'Channel', 'Frequency', 'RSSI', 
-                                  'CurrentLatitude', 'CurrentLongitude', 'AuthMode']
-            columnas_faltantes = [col for col in columnas_requeridas if col not in self.df.columns]
+            columnas_faltantes = [col for col in COLUMNAS_REQUERIDAS if col not in self.df.columns]
             
             if columnas_faltantes:
                 print(f"  Columnas faltantes: {columnas_faltantes}")
                 print(f" Columnas disponibles: {list(self.df.columns)}")
-                
-                # Intentar mapear nombres alternativos comunes
-                mapeo_columnas = {
-                    'SSID': ['SSID', 'ssid', 'Ssid'],
-                    'FirstSeen': ['FirstSeen', 'First seen', 'firstseen', 'Timestamp'],
-                    'Channel': ['Channel', 'channel', 'CH'],
-                    'Frequency': ['Frequency', 'frequency', 'Freq'],
-                    'RSSI': ['RSSI', 'rssi', 'Signal'],
-                    'CurrentLatitude': ['CurrentLatitude', 'Latitude', 'Lat', 'latitude'],
-                    'CurrentLongitude': ['CurrentLongitude', 'Longitude', 'Lon', 'longitude'],
-                    'AuthMode': ['AuthMode', 'Authentication', 'Encryption', 'auth']
-                }
-                
-                for col_requerida in columnas_faltantes:
-                    for posible_nombre in mapeo_columnas.get(col_requerida, []):
-                        if posible_nombre in self.df.columns:
-                            self.df[col_requerida] = self.df[posible_nombre]
-                            print(f" Mapeada columna '{posible_nombre}' a '{col_requerida}'")
-                            break
             
             # Preparar datos
             try:
-                self.df['Timestamp'] = pd.to_datetime(self.df['FirstSeen'], errors='coerce')
+                self.df['Timestamp'] = self._parsear_fechas(self.df['FirstSeen'])
                 
                 # Limpiar y convertir datos numéricos
                 if 'Channel' in self.df.columns:
-                    self.df['Channel'] = pd.to_numeric(self.df['Channel'], errors='coerce').fillna(0).astype(int)
+                    self.df['Channel'] = pd.to_numeric(self.df['Channel'], errors='coerce').fillna(0).astype(np.int16)
                 
                 if 'Frequency' in self.df.columns:
-                    self.df['Frequency'] = pd.to_numeric(self.df['Frequency'], errors='coerce').fillna(0).astype(int)
+                    self.df['Frequency'] = pd.to_numeric(self.df['Frequency'], errors='coerce').fillna(0).astype(np.int16)
                 
                 if 'RSSI' in self.df.columns:
-                    self.df['RSSI'] = pd.to_numeric(self.df['RSSI'], errors='coerce')
+                    self.df['RSSI'] = pd.to_numeric(self.df['RSSI'], errors='coerce').astype(np.float32)
                 
                 # Limpiar coordenadas
                 if 'CurrentLatitude' in self.df.columns:
@@ -121,7 +257,23 @@ class WardrivingAnalyzer:
                     self.df['CurrentLongitude'] = pd.to_numeric(self.df['CurrentLongitude'], errors='coerce')
                     self.df = self.df.dropna(subset=['CurrentLongitude'])
                 
+                # Las coordenadas se mantienen en float64: float32 solo guarda ~7 dígitos
+                # significativos (~1 m de error) y separaría puntos al agrupar por ubicación
+                
+                # SSID y AuthMode se repiten mucho: como categoría se guardan una sola vez
+                for columna in ('SSID', 'AuthMode'):
+                    if columna in self.df.columns:
+                        self.df[columna] = self.df[columna].astype('category')
+                
+                # Solo se conservan las columnas del análisis, por si algún lector trajo otras
+                self.df = self.df[[col for col in COLUMNAS_CACHE if col in self.df.columns]]
+                
+                # Orden temporal una sola vez (estable); la caché Parquet ya queda ordenada
+                self.df.sort_values('Timestamp', inplace=True, kind='mergesort')
+                self.df.reset_index(drop=True, inplace=True)
+                
                 print(f" Datos preparados: {len(self.df)} registros válidos")
+                self._guardar_cache_parquet(pq_path)
                 return True
                 
             except Exception as e:
@@ -132,25 +284,159 @@ class WardrivingAnalyzer:
             print(f" Error al cargar datos: {e}")
             return False
     
+    def _parsear_fechas(self, fechas: pd.Series) -> pd.Series:
+        """
+        Convierte FirstSeen con el formato fijo de Wigle y reintenta como ISO8601
+        solo las filas que no encajan en él
+        """
+        timestamp = pd.to_datetime(fechas, format=FORMATO_FECHA_WIGLE, errors='coerce', cache=True)
+        
+        fallidas = timestamp.isna() & fechas.notna()
+        if fallidas.any():
+            timestamp[fallidas] = pd.to_datetime(fechas[fallidas], format='ISO8601',
+                                                 errors='coerce', cache=True)
+        return timestamp
+    
+    def _firma_csv(self) -> bytes:
+        """Tamaño y fecha de modificación (ns) del CSV, guardados en la caché Parquet"""
+        estado = os.stat(self.archivo_csv)
+        return f"{estado.st_size}:{estado.st_mtime_ns}".encode()
+    
+    def _cargar_cache_parquet(self, pq_path: str) -> bool:
+        """
+        Carga los datos ya preparados desde la caché Parquet si corresponde al
+        CSV actual: mismo tamaño y misma fecha de modificación que al guardarla
+        """
+        if pq is None or not os.path.exists(pq_path):
+            return False
+        
+        try:
+            metadatos = pq.read_schema(pq_path).metadata or {}
+            if metadatos.get(CLAVE_FIRMA_CACHE) != self._firma_csv():
+                print(f"  Caché Parquet desactualizada ({pq_path}), se relee el CSV")
+                return False
+            self.df = pd.read_parquet(pq_path, columns=COLUMNAS_CACHE, engine='pyarrow')
+        except Exception as e:
+            print(f"  Caché Parquet no válida, se relee el CSV: {e}")
+            self.df = None
+            return False
+        
+        print(f" Datos cargados desde caché Parquet ({pq_path}): {len(self.df)} registros válidos")
+        return True
+    
+    def _guardar_cache_parquet(self, pq_path: str):
+        """
+        Guarda los datos preparados en Parquet (zstd, cadenas con diccionario)
+        junto con la firma del CSV; si el directorio no admite escritura se omite
+        """
+        if pq is None or any(col not in self.df.columns for col in COLUMNAS_CACHE):
+            return
+        
+        directorio = os.path.dirname(os.path.abspath(pq_path))
+        if not os.access(directorio, os.W_OK):
+            print(f"  Directorio sin permiso de escritura: no se guarda la caché Parquet")
+            return
+        
+        # Se escribe a un temporal y se renombra: nunca queda una caché a medias
+        temporal = pq_path + '.tmp'
+        try:
+            tabla = pa.Table.from_pandas(self.df[COLUMNAS_CACHE], preserve_index=False)
+            tabla = tabla.replace_schema_metadata({**(tabla.schema.metadata or {}),
+                                                   CLAVE_FIRMA_CACHE: self._firma_csv()})
+            pq.write_table(tabla, temporal, compression='zstd', row_group_size=100_000)
+            os.replace(temporal, pq_path)
+            print(f" Caché Parquet guardada en {pq_path}")
+        except Exception as e:
+            print(f"  No se pudo guardar la caché Parquet: {e}")
+            if os.path.exists(temporal):
+                os.remove(temporal)
+    
+    def _resolver_columnas(self) -> Tuple[Dict[str, str], int]:
+        """
+        Busca el encabezado en las dos primeras líneas del CSV (Wigle antepone
+        una línea de metadatos) y devuelve {nombre en el archivo: nombre
+        requerido} para las columnas a parsear junto con la fila del encabezado
+        """
+        with open(self.archivo_csv, newline='', encoding='utf-8', errors='replace') as f:
+            lineas = [linea for _, linea in zip(range(2), f)]
+        
+        mejor = {}
+        fila_encabezado = 1
+        for fila, encabezado in enumerate(csv.reader(lineas)):
+            nombres = {nombre.strip(): nombre for nombre in encabezado}
+            columnas = {}
+            for col_requerida, alternativas in MAPEO_COLUMNAS.items():
+                for posible_nombre in alternativas:
+                    if posible_nombre in nombres:
+                        columnas[nombres[posible_nombre]] = col_requerida
+                        break
+            if len(columnas) > len(mejor):
+                mejor = columnas
+                fila_encabezado = fila
+        
+        for nombre, col_requerida in mejor.items():
+            if nombre.strip() != col_requerida:
+                print(f" Mapeada columna '{nombre.strip()}' a '{col_requerida}'")
+        
+        return mejor, fila_encabezado
+    
+    def _leer_csv_pyarrow(self, columnas: Dict[str, str], fila_encabezado: int = 1) -> pd.DataFrame:
+        """Lee el CSV con el tokenizador de pyarrow saltando las líneas previas al encabezado"""
+        if pacsv is None:
+            raise ImportError("pyarrow no está instalado")
+        
+        tipos = {nombre: PYARROW_COLUMN_TYPES[col] for nombre, col in columnas.items()
+                 if col in PYARROW_COLUMN_TYPES}
+        ro = pacsv.ReadOptions(skip_rows=fila_encabezado, block_size=8 << 20)
+        po = pacsv.ParseOptions(invalid_row_handler=lambda r: 'skip')
+        co = pacsv.ConvertOptions(column_types=tipos, include_columns=list(columnas),
+                                  strings_can_be_null=True)
+        
+        table = pacsv.read_csv(self.archivo_csv, read_options=ro, parse_options=po, convert_options=co)
+        return table.to_pandas().rename(columns=columnas)
+    
+    def _leer_csv_por_bloques(self, columnas: Dict[str, str], fila_encabezado: int = 1) -> pd.DataFrame:
+        """Lee el CSV por bloques para limitar la memoria máxima en capturas grandes"""
+        tipos = {nombre: TIPOS_CSV[col] for nombre, col in columnas.items() if col in TIPOS_CSV}
+        bloques = []
+        for bloque in pd.read_csv(self.archivo_csv, skiprows=fila_encabezado, chunksize=TAMANO_BLOQUE_CSV,
+                                  dtype=tipos, usecols=list(columnas) or None,
+                                  on_bad_lines='skip'):
+            bloque = bloque.rename(columns=columnas)
+            bloques.append(bloque.dropna(subset=['CurrentLatitude', 'CurrentLongitude']))
+        return pd.concat(bloques, ignore_index=True)
+    
+    def _resumen_rssi(self) -> Dict[str, Any]:
+        """Resumen de RSSI compartido por reporte, calidad de señal y mapa de calor"""
+        if self._resumen_rssi_cache is None:
+            self._resumen_rssi_cache = _resumir_rssi(self.df['RSSI'].to_numpy(dtype=np.float64))
+        return self._resumen_rssi_cache
+    
     def analizar_general(self) -> Dict[str, Any]:
         """Realiza análisis general de los datos"""
         if self.df is None or self.df.empty:
             return {}
         
+        if self._analisis_cache is not None:
+            return self._analisis_cache
+        
         try:
+            resumen = self._resumen_rssi()
             resultados = {
                 'total_registros': len(self.df),
                 'periodo_captura': f"{self.df['FirstSeen'].min()} - {self.df['FirstSeen'].max()}",
                 'redes_unicas': self.df['SSID'].nunique(),
                 'top_redes': self.df['SSID'].value_counts().head(5).to_dict(),
                 'metricas_rssi': {
-                    'promedio': self.df['RSSI'].mean(),
-                    'minimo': self.df['RSSI'].min(),
-                    'maximo': self.df['RSSI'].max(),
-                    'desviacion': self.df['RSSI'].std()
-                }
+                    'promedio': resumen['promedio'],
+                    'minimo': resumen['minimo'],
+                    'maximo': resumen['maximo'],
+                    'desviacion': resumen['desviacion']
+                },
+                'rssi_por_ssid': self.df.groupby('SSID', observed=True)['RSSI'].mean()
             }
             
+            self._analisis_cache = resultados
             return resultados
         except Exception as e:
             print(f"  Error en análisis general: {e}")
@@ -171,10 +457,12 @@ class WardrivingAnalyzer:
             )
             
             # Preparar datos para heatmap
-            heat_data = []
-            for _, row in self.df.iterrows():
-                intensity = max(0.1, min(1.0, (row['RSSI'] + 100) / 40))
-                heat_data.append([row['CurrentLatitude'], row['CurrentLongitude'], intensity])
+            intensity = self._resumen_rssi()['intensidad']
+            heat_data = np.column_stack([
+                self.df['CurrentLatitude'].to_numpy(dtype=np.float64),
+                self.df['CurrentLongitude'].to_numpy(dtype=np.float64),
+                intensity,
+            ]).tolist()
             
             HeatMap(heat_data, radius=15, blur=10, max_zoom=1).add_to(mapa)
             
@@ -201,29 +489,34 @@ class WardrivingAnalyzer:
                 tiles='OpenStreetMap'
             )
             
-            # Agrupar por SSID y coordenadas
-            grupos = self.df.groupby(['SSID', 'CurrentLatitude', 'CurrentLongitude'])
-            colores = ['red', 'blue', 'green', 'purple', 'orange', 'darkred', 'darkblue']
+            # Agrupar por SSID y coordenadas en una sola agregación
+            agg = (self.df.groupby(['SSID', 'CurrentLatitude', 'CurrentLongitude'], observed=True)['RSSI']
+                   .agg(['mean', 'size']).reset_index())
+            lat = agg['CurrentLatitude'].to_numpy()
+            lon = agg['CurrentLongitude'].to_numpy()
             
-            for color_idx, ((ssid, lat, lon), group) in enumerate(grupos):
-                rssi_promedio = group['RSSI'].mean()
-                cantidad = len(group)
+            # Con muchos grupos, un solo marcador agrupado evita miles de objetos en el HTML
+            if len(agg) >= UMBRAL_MARCADORES_AGRUPADOS:
+                FastMarkerCluster(data=np.column_stack([lat, lon]).tolist()).add_to(mapa)
+                print(f" {len(agg)} ubicaciones: usando FastMarkerCluster sin popups")
+            else:
+                colores = ['red', 'blue', 'green', 'purple', 'orange', 'darkred', 'darkblue']
                 
-                popup_text = f"""
-                <b>{ssid}</b><br>
-                Ubicación: {lat:.6f}, {lon:.6f}<br>
-                RSSI: {rssi_promedio:.1f} dBm<br>
-                Detecciones: {cantidad}
-                """
+                # Textos de los popups formateados por columnas en lugar de fila a fila
+                popups = ('<b>' + agg['SSID'].astype(str) + '</b><br>Ubicación: '
+                          + np.char.mod('%.6f', lat) + ', ' + np.char.mod('%.6f', lon)
+                          + '<br>RSSI: ' + np.char.mod('%.1f', agg['mean'].to_numpy())
+                          + ' dBm<br>Detecciones: ' + agg['size'].astype(str)).to_numpy()
                 
-                folium.CircleMarker(
-                    location=[lat, lon],
-                    radius=8,
-                    popup=popup_text,
-                    color=colores[color_idx % len(colores)],
-                    fill=True,
-                    fillOpacity=0.6
-                ).add_to(mapa)
+                for color_idx, (lat_p, lon_p, popup_text) in enumerate(zip(lat, lon, popups)):
+                    folium.CircleMarker(
+                        location=[lat_p, lon_p],
+                        radius=8,
+                        popup=popup_text,
+                        color=colores[color_idx % len(colores)],
+                        fill=True,
+                        fillOpacity=0.6
+                    ).add_to(mapa)
             
             archivo_mapa = f"mapa_localizacion_{self.nombre_base}.html"
             mapa.save(archivo_mapa)
@@ -234,6 +527,46 @@ class WardrivingAnalyzer:
             print(f" Error generando mapa de localización: {e}")
             return ""
     
+    def _estadisticas_rssi_por_canal(self) -> Tuple[List[Dict[str, Any]], pd.Series]:
+        """
+        Calcula en un solo agrupamiento las estadísticas del boxplot por canal
+        (cuartiles, bigotes a 1.5·IQR y valores atípicos, igual que Matplotlib)
+        y el RSSI medio por canal
+        """
+        datos = self.df[['Channel', 'RSSI']].dropna()
+        canal = datos['Channel']
+        rssi = datos['RSSI'].astype(np.float64)
+        grupos = rssi.groupby(canal, sort=True, observed=True)
+        
+        media = grupos.mean()
+        cuartiles = grupos.quantile([0.25, 0.5, 0.75]).unstack()
+        q1, mediana, q3 = cuartiles[0.25], cuartiles[0.5], cuartiles[0.75]
+        iqr = q3 - q1
+        
+        # Los bigotes llegan al dato más extremo dentro de 1.5·IQR; el resto son atípicos
+        dentro = ((rssi >= canal.map(q1 - 1.5 * iqr)) & (rssi <= canal.map(q3 + 1.5 * iqr))).to_numpy()
+        bigote_inf = rssi[dentro].groupby(canal[dentro], observed=True).min().reindex(q1.index)
+        bigote_sup = rssi[dentro].groupby(canal[dentro], observed=True).max().reindex(q3.index)
+        bigote_inf = bigote_inf.where(bigote_inf <= q1, q1)
+        bigote_sup = bigote_sup.where(bigote_sup >= q3, q3)
+        atipicos = {c: g.to_numpy() for c, g in rssi[~dentro].groupby(canal[~dentro], observed=True)}
+        
+        stats = [
+            {
+                'label': c,
+                'mean': media[c],
+                'med': mediana[c],
+                'q1': q1[c],
+                'q3': q3[c],
+                'iqr': iqr[c],
+                'whislo': bigote_inf[c],
+                'whishi': bigote_sup[c],
+                'fliers': atipicos.get(c, np.empty(0)),
+            }
+            for c in media.index
+        ]
+        return stats, media
+    
     def generar_graficos(self):
         """Genera gráficos avanzados de análisis"""
         print(" Generando gráficos avanzados...")
@@ -243,12 +576,13 @@ class WardrivingAnalyzer:
             fig, axes = plt.subplots(3, 2, figsize=(15, 15))
             fig.suptitle(f'Análisis Wardriving - {self.nombre_base}', fontsize=16, fontweight='bold')
             
+            # Estadísticas de RSSI por canal compartidas por los paneles 1 y 2
+            if 'Channel' in self.df.columns and 'RSSI' in self.df.columns:
+                stats_canales, rssi_medio_canal = self._estadisticas_rssi_por_canal()
+            
             # 1. Distribución de RSSI por canal (0,0)
             if 'Channel' in self.df.columns and 'RSSI' in self.df.columns:
-                canales_unicos = sorted(self.df['Channel'].dropna().unique())
-                datos_canales = [self.df[self.df['Channel'] == canal]['RSSI'] for canal in canales_unicos]
-                
-                axes[0, 0].boxplot(datos_canales, tick_labels=canales_unicos)
+                axes[0, 0].bxp(stats_canales)
                 axes[0, 0].set_title('Distribución de RSSI por Canal')
                 axes[0, 0].set_xlabel('Canal')
                 axes[0, 0].set_ylabel('RSSI (dBm)')
@@ -256,9 +590,8 @@ class WardrivingAnalyzer:
             
             # 2. Heatmap de canales vs RSSI (0,1)
             if 'Channel' in self.df.columns and 'RSSI' in self.df.columns:
-                canal_rssi = self.df.groupby('Channel')['RSSI'].mean().reset_index()
-                scatter = axes[0, 1].scatter(canal_rssi['Channel'], canal_rssi['RSSI'], 
-                                            c=canal_rssi['RSSI'], cmap='viridis', s=100)
+                scatter = axes[0, 1].scatter(rssi_medio_canal.index, rssi_medio_canal.to_numpy(), 
+                                            c=rssi_medio_canal.to_numpy(), cmap='viridis', s=100)
                 plt.colorbar(scatter, ax=axes[0, 1], label='RSSI Promedio (dBm)')
                 axes[0, 1].set_title('RSSI Promedio por Canal')
                 axes[0, 1].set_xlabel('Canal')
@@ -267,8 +600,11 @@ class WardrivingAnalyzer:
             
             # 3. Evolución temporal del RSSI (1,0)
             if 'Timestamp' in self.df.columns and 'RSSI' in self.df.columns:
-                df_sorted = self.df.sort_values('Timestamp')
-                axes[1, 0].plot(df_sorted['Timestamp'], df_sorted['RSSI'], 'o-', alpha=0.7, markersize=2)
+                # self.df ya está ordenado por Timestamp desde cargar_datos; se diezma con
+                # LTTB porque la mayoría de los puntos se solaparían en el lienzo
+                serie = self.df[['Timestamp', 'RSSI']].dropna()
+                tx, ty = _lttb(serie['Timestamp'].to_numpy(), serie['RSSI'].to_numpy())
+                axes[1, 0].plot(tx, ty, 'o-', alpha=0.7, markersize=2, rasterized=True)
                 axes[1, 0].set_title('Evolución Temporal de la Señal')
                 axes[1, 0].set_xlabel('Tiempo')
                 axes[1, 0].set_ylabel('RSSI (dBm)')
@@ -283,17 +619,26 @@ class WardrivingAnalyzer:
             
             # 5. Mapa de densidad (2,0)
             if all(col in self.df.columns for col in ['CurrentLongitude', 'CurrentLatitude', 'RSSI']):
-                hexbin = axes[2, 0].hexbin(self.df['CurrentLongitude'], self.df['CurrentLatitude'], 
-                                          C=self.df['RSSI'], gridsize=15, cmap='viridis', 
-                                          reduce_C_function=np.mean)
-                plt.colorbar(hexbin, ax=axes[2, 0], label='RSSI Promedio (dBm)')
+                # Media por celda = suma de RSSI / número de detecciones (dos histogramas 2D)
+                densidad = self.df[['CurrentLongitude', 'CurrentLatitude', 'RSSI']].dropna()
+                lon = densidad['CurrentLongitude'].to_numpy()
+                lat = densidad['CurrentLatitude'].to_numpy()
+                rssi = densidad['RSSI'].to_numpy(dtype=np.float64)
+                sumas, xe, ye = np.histogram2d(lon, lat, bins=15, weights=rssi)
+                conteos, _, _ = np.histogram2d(lon, lat, bins=[xe, ye])
+                medias = np.divide(sumas, conteos, out=np.full_like(sumas, np.nan), where=conteos > 0)
+                
+                # Las celdas sin detecciones quedan en blanco, como en hexbin
+                malla = axes[2, 0].pcolormesh(xe, ye, np.ma.masked_invalid(medias.T), cmap='viridis',
+                                             rasterized=True)
+                plt.colorbar(malla, ax=axes[2, 0], label='RSSI Promedio (dBm)')
                 axes[2, 0].set_title('Densidad de Redes y Intensidad de Señal')
                 axes[2, 0].set_xlabel('Longitud')
                 axes[2, 0].set_ylabel('Latitud')
             
             # 6. Distribución de RSSI (2,1)
             if 'RSSI' in self.df.columns:
-                axes[2, 1].hist(self.df['RSSI'], bins=20, alpha=0.7, edgecolor='black')
+                axes[2, 1].hist(self.df['RSSI'], bins=20, alpha=0.7, edgecolor='black', rasterized=True)
                 axes[2, 1].set_title('Distribución de Intensidad de Señal')
                 axes[2, 1].set_xlabel('RSSI (dBm)')
                 axes[2, 1].set_ylabel('Frecuencia')
@@ -301,7 +646,7 @@ class WardrivingAnalyzer:
             
             plt.tight_layout()
             archivo_graficos = f'graficos_avanzados_{self.nombre_base}.png'
-            plt.savefig(archivo_graficos, dpi=300, bbox_inches='tight')
+            plt.savefig(archivo_graficos, dpi=150, bbox_inches='tight')
             plt.close()
             
             print(f" Gráficos guardados: {archivo_graficos}")
@@ -349,9 +694,9 @@ class WardrivingAnalyzer:
         
         # Top redes
         print(f"\n TOP 5 REDES:")
+        rssi_por_ssid = analisis['rssi_por_ssid']
         for ssid, count in analisis['top_redes'].items():
-            red_data = self.df[self.df['SSID'] == ssid]
-            rssi_prom = red_data['RSSI'].mean() if 'RSSI' in red_data.columns else 0
+            rssi_prom = rssi_por_ssid.loc[ssid]
             print(f"  - {ssid}: {count} detecciones | RSSI: {rssi_prom:.1f} dBm")
         
         # Análisis de seguridad
@@ -372,33 +717,35 @@ class WardrivingAnalyzer:
         """Análisis de seguridad de las redes"""
         print(f"\n ANÁLISIS DE SEGURIDAD:")
         
+        # Un solo agrupamiento: SSID únicos por modo de autenticación, en orden de aparición
+        ssids_por_auth = self.df.groupby('AuthMode', observed=True)['SSID'].unique()
+        
         # Redes abiertas
-        redes_abiertas = self.df[self.df['AuthMode'] == 'OPEN']
-        if not redes_abiertas.empty:
-            print(f"  Redes abiertas detectadas: {len(redes_abiertas['SSID'].unique())}")
-            for ssid in list(redes_abiertas['SSID'].unique())[:5]:  # Mostrar solo las primeras 5
+        if 'OPEN' in ssids_por_auth.index:
+            redes_abiertas = ssids_por_auth['OPEN']
+            print(f"  Redes abiertas detectadas: {len(redes_abiertas)}")
+            for ssid in list(redes_abiertas)[:5]:  # Mostrar solo las primeras 5
                 print(f"    - {ssid}")
         
         # Redes WEP (encriptación débil)
-        redes_wep = self.df[self.df['AuthMode'] == 'WEP']
-        if not redes_wep.empty:
-            print(f"  Redes WEP (encriptación débil): {len(redes_wep['SSID'].unique())}")
-            for ssid in list(redes_wep['SSID'].unique())[:5]:  # Mostrar solo las primeras 5
+        if 'WEP' in ssids_por_auth.index:
+            redes_wep = ssids_por_auth['WEP']
+            print(f"  Redes WEP (encriptación débil): {len(redes_wep)}")
+            for ssid in list(redes_wep)[:5]:  # Mostrar solo las primeras 5
                 print(f"    - {ssid}")
         
-        # Redes con buena seguridad
-        redes_seguras = self.df[self.df['AuthMode'].str.contains('WPA2', na=False)]
-        if not redes_seguras.empty:
-            print(f" Redes con encriptación WPA2: {len(redes_seguras['SSID'].unique())}")
+        # Redes con buena seguridad: unión de los SSID de todos los modos con WPA2
+        # (la búsqueda de texto se hace sobre los pocos modos, no sobre las filas)
+        modos_wpa2 = ssids_por_auth.index[ssids_por_auth.index.astype(str).str.contains('WPA2')]
+        if len(modos_wpa2):
+            redes_seguras = pd.unique(np.concatenate([np.asarray(ssids_por_auth[modo]) for modo in modos_wpa2]))
+            print(f" Redes con encriptación WPA2: {len(redes_seguras)}")
     
     def _analizar_calidad_señal(self):
         """Análisis de calidad de señal"""
         print(f"\n CALIDAD DE SEÑAL:")
         
-        excelente = len(self.df[self.df['RSSI'] > -65])
-        buena = len(self.df[(self.df['RSSI'] >= -75) & (self.df['RSSI'] <= -65)])
-        aceptable = len(self.df[(self.df['RSSI'] >= -85) & (self.df['RSSI'] < -75)])
-        debil = len(self.df[self.df['RSSI'] < -85])
+        debil, aceptable, buena, excelente = self._resumen_rssi()['conteos']
         
         total = len(self.df)
         
@@ -431,25 +778,26 @@ def main():
     print("=" * 60)
     
     # Ejecutar análisis seleccionado
-    archivos_generados = []
-    
-    if args.todo or args.reporte:
-        analyzer.generar_reporte()
-    
+    tareas = []
     if args.todo or args.mapa_calor:
-        archivo = analyzer.generar_mapa_calor()
-        if archivo:
-            archivos_generados.append(archivo)
-    
+        tareas.append(analyzer.generar_mapa_calor)
     if args.todo or args.mapa_localizacion:
-        archivo = analyzer.generar_mapa_localizacion()
-        if archivo:
-            archivos_generados.append(archivo)
-    
+        tareas.append(analyzer.generar_mapa_localizacion)
     if args.todo or args.graficos:
-        archivo = analyzer.generar_graficos()
-        if archivo:
-            archivos_generados.append(archivo)
+        tareas.append(analyzer.generar_graficos)
+    
+    # Mapas y gráficos son independientes: con más de uno se generan en procesos separados
+    if len(tareas) > 1:
+        with ProcessPoolExecutor(max_workers=len(tareas)) as executor:
+            futuros = [executor.submit(tarea) for tarea in tareas]
+            resultados = [futuro.result() for futuro in futuros]
+    else:
+        resultados = [tarea() for tarea in tareas]
+    
+    archivos_generados = [archivo for archivo in resultados if archivo]
+    
+    if args.todo or args.reporte:
+        analyzer.generar_reporte()
     
     # Mostrar resumen
     if archivos_generados:
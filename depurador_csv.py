@@ -1,38 +1,112 @@
-import pandas as pd
-import numpy as np
 import argparse
 import sys
 import os
+import re
+import csv
+import io
+import mmap
+import time
 from datetime import datetime
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+# pandas y numpy se importan dentro de las funciones que los usan: el análisis
+# (--solo-analisis) no los necesita y así arranca sin cargarlos
+
+# Líneas leídas para el análisis: metadatos, encabezados y 10 líneas de datos
+ANALYSIS_HEAD_LINES = 12
+
+# Bytes iniciales leídos para estimar el total de líneas sin recorrer el archivo
+LINE_SAMPLE_BYTES = 1 << 20
+
+# Cada cuántas líneas se informa el progreso con --verbose
+PROGRESS_INTERVAL = 100_000
+
+# Tamaño a partir del cual la reparación se reparte entre varios procesos
+PARALLEL_MIN_BYTES = 64 << 20
 
-def analyze_date_problems(csv_file):
+# Patrones de fecha precompilados: AAAA-MM-DD, AAAA/MM/DD, DD/MM/AAAA y DD-MM-AAAA
+# (la referencia \1 / \2 exige el mismo separador en ambas posiciones). Con
+# re.ASCII, \d y la comparación sin mayúsculas usan tablas ASCII en vez de Unicode.
+_DATE_RE = re.compile(r'\d{4}([-/])\d{2}\1\d{2}|\d{2}([-/])\d{2}\2\d{4}', re.ASCII)
+
+# Componentes de fecha (años, meses, am/pm) buscados en una sola pasada con una
+# alternancia compilada, sin convertir antes el valor a minúsculas
+_DATE_KEYWORDS = ('2023', '2024', '2025', 'jan', 'feb', 'mar', 'apr', 'may', 'jun',
+                  'jul', 'aug', 'sep', 'oct', 'nov', 'dec', 'am', 'pm')
+_DATE_KW_RE = re.compile('|'.join(map(re.escape, _DATE_KEYWORDS)), re.IGNORECASE | re.ASCII)
+
+# Nombres de columna que sugieren una fecha (FirstSeen, LastSeen, Timestamp...)
+_DATE_HEADER_RE = re.compile(r'TIME|DATE|SEEN|FIRST|LAST', re.IGNORECASE)
+
+# Valores de columnas de fecha que en realidad son modos de autenticación o vacíos
+_NON_DATE = frozenset({'WPA2', 'WPA', 'WEP', 'OPN', 'OPEN', 'UNKNOWN', 'N/A', 'NULL'})
+
+# Formatos de fecha reconocibles, en orden de prueba, y formato estándar de salida
+_DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%d/%m/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+    '%Y/%m/%d %H:%M:%S',
+    '%d-%m-%Y %H:%M:%S',
+    '%m-%d-%Y %H:%M:%S',
+    '%Y%m%d%H%M%S',
+)
+_OUTPUT_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Despacho de formatos para repair_date_field: los dígitos iniciales (año de 4
+# cifras o día/mes de 1-2) y el separador que los sigue determinan qué formatos
+# de _DATE_FORMATS pueden encajar, en el mismo orden; sin separador solo queda
+# el formato compacto. \d sin re.ASCII, igual que en strptime
+_DATE_LEAD_RE = re.compile(r'(\d+)([-/])')
+_FORMATS_BY_LEAD = {
+    (4, '-'): ('%Y-%m-%d %H:%M:%S',),
+    (4, '/'): ('%Y/%m/%d %H:%M:%S',),
+    (1, '/'): ('%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S'),
+    (2, '/'): ('%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S'),
+    (1, '-'): ('%d-%m-%Y %H:%M:%S', '%m-%d-%Y %H:%M:%S'),
+    (2, '-'): ('%d-%m-%Y %H:%M:%S', '%m-%d-%Y %H:%M:%S'),
+}
+_COMPACT_FORMATS = ('%Y%m%d%H%M%S',)
+
+def _read_head(csv_file):
+    """
+    Lee solo las líneas necesarias para el análisis: metadatos, encabezados y 10 de datos
+    """
+    with open(csv_file, 'rb') as f:
+        return [line.decode('utf-8', errors='ignore') for line in islice(f, ANALYSIS_HEAD_LINES)]
+
+def analyze_date_problems(csv_file, head=None, count_lines=True):
     """
     Analiza específicamente problemas con formatos de fecha en el archivo CSV
+    (head permite reutilizar las líneas iniciales ya leídas y count_lines=False
+    evita recorrer el archivo completo solo para contar sus líneas)
     """
     print(f"ANALIZANDO PROBLEMAS DE FECHA EN: {csv_file}")
     print("=" * 60)
     
     try:
-        # Leer el archivo línea por línea
-        with open(csv_file, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
+        if head is None:
+            head = _read_head(csv_file)
         
-        print(f"Total de líneas en el archivo: {len(lines)}")
+        if count_lines:
+            total_lines, exact = _estimate_lines(csv_file)
+            if exact:
+                print(f"Total de líneas en el archivo: {total_lines}")
+            else:
+                print(f"Total de líneas en el archivo (estimado): ~{total_lines}")
         
-        if len(lines) < 2:
+        if len(head) < 2:
             print("El archivo está vacío o tiene muy pocas líneas")
-            return None, []
+            return None, [], []
         
         # Analizar estructura de encabezados
         print("\nANALIZANDO ESTRUCTURA:")
-        headers = lines[1].strip().split(',')  # Segunda línea como encabezados
+        headers = next(csv.reader([head[1].strip()]), [])  # Segunda línea como encabezados
         print(f"Encabezados detectados ({len(headers)}): {headers}")
         
         # Buscar la columna que debería contener fechas
-        date_columns = []
-        for i, header in enumerate(headers):
-            if any(keyword in header.upper() for keyword in ['TIME', 'DATE', 'SEEN', 'FIRST', 'LAST']):
-                date_columns.append((i, header))
+        date_columns = _detect_date_columns(headers)
         
         print(f"Columnas potencialmente de fecha: {date_columns}")
         
@@ -40,11 +114,8 @@ def analyze_date_problems(csv_file):
         date_samples = {}
         problematic_lines = []
         
-        for line_num, line in enumerate(lines[2:12], start=3):  # Primeras 10 líneas de datos
-            if line_num >= len(lines):
-                break
-                
-            fields = line.strip().split(',')
+        data_lines = csv.reader(line.strip() for line in head[2:])
+        for line_num, fields in enumerate(data_lines, start=3):  # Primeras 10 líneas de datos
             for col_idx, col_name in date_columns:
                 if col_idx < len(fields):
                     value = fields[col_idx]
@@ -71,6 +142,28 @@ def analyze_date_problems(csv_file):
         print(f"ERROR durante el análisis: {e}")
         return None, [], []
 
+def _estimate_lines(csv_file):
+    """
+    Estima las líneas del archivo a partir de su tamaño y de la longitud media de
+    línea en los primeros LINE_SAMPLE_BYTES. Devuelve (líneas, exacto): si el
+    archivo cabe entero en la muestra, el recuento es exacto
+    """
+    size = os.path.getsize(csv_file)
+    with open(csv_file, 'rb') as f:
+        sample = f.read(LINE_SAMPLE_BYTES)
+    
+    count = sample.count(b'\n')
+    if len(sample) >= size:
+        # Una última línea sin salto final también cuenta
+        return count + (sample[-1:] not in (b'\n', b'')), True
+    return size * count // len(sample), False
+
+def _detect_date_columns(headers):
+    """
+    Devuelve (índice, nombre) de las columnas cuyo nombre sugiere una fecha
+    """
+    return [(i, header) for i, header in enumerate(headers) if _DATE_HEADER_RE.search(header)]
+
 def looks_like_date(value):
     """
     Determina si un valor parece ser una fecha
@@ -78,170 +171,407 @@ def looks_like_date(value):
     if not value or value.strip() == '':
         return False
     
-    # Patrones comunes de fecha
-    date_patterns = [
-        r'\d{4}-\d{2}-\d{2}',
-        r'\d{2}/\d{2}/\d{4}',
-        r'\d{2}-\d{2}-\d{4}',
-        r'\d{4}/\d{2}/\d{2}',
-    ]
-    
     value_str = str(value).strip()
     
-    # Verificar patrones
-    for pattern in date_patterns:
-        if re.search(pattern, value_str):
-            return True
-    
-    # Verificar si contiene componentes de fecha
-    date_keywords = ['2024', '2025', '2023', 'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                    'jul', 'aug', 'sep', 'oct', 'nov', 'dec', 'am', 'pm']
-    
-    if any(keyword in value_str.lower() for keyword in date_keywords):
-        return True
-    
-    return False
+    # Patrones comunes de fecha o componentes de fecha (años, meses, am/pm)
+    return bool(_DATE_RE.search(value_str) or _DATE_KW_RE.search(value_str))
 
-def repair_date_issues(csv_file, output_file=None):
+def repair_date_issues(csv_file, output_file=None, verbose=False):
     """
     Repara problemas específicos de formato de fecha en el archivo CSV
+    (con verbose se muestra el progreso de la reparación línea por línea)
     """
+    import pandas as pd
+    import numpy as np
     if output_file is None:
         output_file = csv_file.replace('.csv', '_fixed.csv')
     
     print(f"\nREPARANDO PROBLEMAS DE FECHA")
     print("=" * 50)
     
-    headers, problematic_lines, date_columns = analyze_date_problems(csv_file)
+    # Las líneas iniciales se leen una sola vez y se reutilizan en el análisis y
+    # en la reparación; el total de líneas lo informa la propia reparación
+    head = _read_head(csv_file)
+    headers, problematic_lines, date_columns = analyze_date_problems(csv_file, head=head, count_lines=False)
     
     if not headers:
         print("No se puede proceder con la reparación")
         return None
     
+    # Las dos primeras líneas (metadatos y encabezados) se copian sin cambios
+    head_lines = [line.strip() for line in head[:2]]
+    
+    # Fecha actual para los valores que no son fecha: una sola vez por ejecución
+    now_str = time.strftime(_OUTPUT_FORMAT)
+    
+    # Ruta rápida: tokenizador C de pandas y conversión por columnas, repartida
+    # entre varios procesos cuando el archivo es grande
+    try:
+        result = None
+        if os.path.getsize(csv_file) >= PARALLEL_MIN_BYTES and (os.cpu_count() or 1) > 1:
+            result = _repair_in_parallel(csv_file, output_file, head_lines, len(headers), date_columns, now_str)
+        if result is None:
+            result = _repair_with_pandas(csv_file, output_file, head_lines, len(headers), date_columns, now_str)
+    except (pd.errors.ParserError, ValueError) as e:
+        print(f"  Ruta vectorizada no aplicable ({str(e).strip()}); se repara línea por línea")
+        result = None
+    except Exception as e:
+        print(f"ERROR durante la reparación: {e}")
+        return None
+    
+    if result is not None:
+        lines_processed, corrections_made = result
+        _print_repair_stats(csv_file, output_file, lines_processed, corrections_made, date_columns)
+        return output_file
+    
     try:
-        # Leer el archivo original
-        with open(csv_file, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        
-        repaired_lines = []
-        corrections_made = 0
         date_column_indices = [idx for idx, name in date_columns]
         
         print(f"\nAPLICANDO CORRECCIONES DE FECHA...")
         
-        for line_num, line in enumerate(lines):
-            original_line = line.strip()
-            
-            # Mantener las primeras dos líneas (metadatos y encabezados) sin cambios
-            if line_num < 2:
-                repaired_lines.append(original_line)
-                continue
-            
-            fields = original_line.split(',')
-            
-            # Reparar campos de fecha
-            line_corrected = False
-            for col_idx in date_column_indices:
-                if col_idx < len(fields):
-                    original_value = fields[col_idx]
-                    repaired_value = repair_date_field(original_value)
-                    
-                    if repaired_value != original_value:
-                        fields[col_idx] = repaired_value
-                        line_corrected = True
-                        corrections_made += 1
-                        
-                        if corrections_made <= 5:  # Mostrar solo las primeras 5 correcciones
-                            print(f"  Línea {line_num}: '{original_value}' → '{repaired_value}'")
-            
-            repaired_lines.append(','.join(fields))
-            
-            # Mostrar progreso cada 100 líneas
-            if line_num % 100 == 0 and line_num > 0:
-                print(f"  Procesadas {line_num} líneas...")
-        
-        # Guardar archivo reparado
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for line in repaired_lines:
-                f.write(line + '\n')
-        
-        print(f"\nREPARACIÓN DE FECHAS COMPLETADA")
-        print("=" * 40)
-        print(f"ESTADÍSTICAS:")
-        print(f"   - Archivo original: {csv_file}")
-        print(f"   - Archivo reparado: {output_file}")
-        print(f"   - Líneas procesadas: {len(repaired_lines)}")
-        print(f"   - Correcciones de fecha aplicadas: {corrections_made}")
-        print(f"   - Columnas de fecha identificadas: {[name for idx, name in date_columns]}")
+        # Primera pasada: separar campos con el tokenizador C de csv y reunir
+        # los valores de las columnas de fecha. De cada registro se guarda su
+        # texto original; solo se vuelven a separar y unir los que cambien
+        rows = []
+        positions = []
+        values = []
+        record_lines = []
+        
+        def track_lines(lines):
+            # Guarda las líneas físicas que el lector va consumiendo para el registro actual
+            for line in lines:
+                record_lines.append(line)
+                yield line
         
+        # El archivo se proyecta en memoria (mmap): las líneas se leen directamente
+        # de la caché de páginas del sistema, sin un búfer de lectura adicional
+        with open(csv_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Saltar las dos primeras líneas, que se conservan en head_lines
+            mm.readline()
+            mm.readline()
+            lines = (raw.decode('utf-8', errors='ignore') for raw in iter(mm.readline, b''))
+            for line_num, fields in enumerate(csv.reader(track_lines(lines)), start=2):
+                rows.append(''.join(record_lines).strip())
+                record_lines.clear()
+                
+                # Igual que line.strip(): sin espacios al inicio ni al final de la línea
+                if fields:
+                    fields[0] = fields[0].lstrip()
+                    fields[-1] = fields[-1].rstrip()
+                if fields == ['']:
+                    fields = []
+                
+                for col_idx in date_column_indices:
+                    if col_idx < len(fields):
+                        positions.append((line_num - 2, col_idx))
+                        values.append(fields[col_idx])
+                
+                # Mostrar progreso solo en modo detallado
+                if verbose and line_num % PROGRESS_INTERVAL == 0:
+                    print(f"  Procesadas {line_num} líneas...")
+        
+        # Reparar todos los campos de fecha de una vez, por columnas
+        original_values = pd.Series(values, dtype=object)
+        repaired_values = _repair_date_column(original_values, now_str)
+        changed = np.flatnonzero((repaired_values != original_values).to_numpy())
+        
+        dirty_rows = {}
+        for k in changed:
+            row, col_idx = positions[k]
+            dirty_rows.setdefault(row, []).append((col_idx, repaired_values.iat[k]))
+        
+        # Solo las filas corregidas se separan de nuevo y se vuelven a escribir con
+        # csv.writer, que entrecomilla los campos que lo necesiten
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='')
+        for row, repairs in dirty_rows.items():
+            # StringIO con newline='' corta solo en finales de línea reales (no en \x0c, \x85...)
+            fields = next(csv.reader(io.StringIO(rows[row], newline='')))
+            for col_idx, value in repairs:
+                fields[col_idx] = value
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(fields)
+            rows[row] = buffer.getvalue()
+        
+        for k in changed[:5]:  # Mostrar solo las primeras 5 correcciones
+            print(f"  Línea {positions[k][0] + 2}: '{original_values.iat[k]}' → '{repaired_values.iat[k]}'")
+        
+        corrections_made = len(changed)
+        
+        # Guardar archivo reparado con una sola escritura
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            f.write('\n'.join(head_lines + rows) + '\n')
+        
+        _print_repair_stats(csv_file, output_file, len(rows) + 2, corrections_made, date_columns)
         return output_file
         
     except Exception as e:
         print(f"ERROR durante la reparación: {e}")
         return None
 
-def repair_date_field(value):
+def _print_repair_stats(csv_file, output_file, lines_processed, corrections_made, date_columns):
     """
-    Repara un campo individual que debería ser una fecha
+    Muestra el resumen de la reparación de fechas
+    """
+    print(f"\nREPARACIÓN DE FECHAS COMPLETADA")
+    print("=" * 40)
+    print(f"ESTADÍSTICAS:")
+    print(f"   - Archivo original: {csv_file}")
+    print(f"   - Archivo reparado: {output_file}")
+    print(f"   - Líneas procesadas: {lines_processed}")
+    print(f"   - Correcciones de fecha aplicadas: {corrections_made}")
+    print(f"   - Columnas de fecha identificadas: {[name for idx, name in date_columns]}")
+
+def _repair_with_pandas(csv_file, output_file, head_lines, n_columns, date_columns, now_str):
+    """
+    Repara las columnas de fecha con pandas en lugar de línea por línea.
+    Devuelve (líneas procesadas, correcciones) o None si _read_data_rows no
+    puede leer los datos sin alterar alguna fila.
+    """
+    df = _read_data_rows(csv_file, _data_start(csv_file), os.path.getsize(csv_file), n_columns)
+    if df is None:
+        return None
+    
+    print(f"\nAPLICANDO CORRECCIONES DE FECHA...")
+    
+    first_changes, corrections_made = _repair_frame(df, date_columns, now_str)
+    for row, original_value, repaired_value in first_changes:
+        print(f"  Línea {row + 2}: '{original_value}' → '{repaired_value}'")
+    
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        f.write('\n'.join(head_lines) + '\n')
+        df.to_csv(f, header=False, index=False, lineterminator='\n')
+    
+    return len(df) + len(head_lines), corrections_made
+
+def _data_start(csv_file):
+    """
+    Posición en bytes donde empiezan los datos, tras metadatos y encabezados
+    """
+    with open(csv_file, 'rb') as f:
+        f.readline()
+        f.readline()
+        return f.tell()
+
+def _read_data_rows(csv_file, start, end, n_columns):
+    """
+    Lee como texto las filas del rango de bytes [start, end) con el lector CSV
+    de pyarrow sobre el archivo proyectado en memoria. Las filas con más o menos
+    campos que encabezados producen ArrowInvalid (un ValueError). Devuelve None
+    si pyarrow no está instalado o si hay líneas vacías, que pyarrow convierte
+    en filas de campos vacíos: solo la ruta línea por línea las conserva tal cual
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pacsv
+    except ImportError:
+        return None
+    
+    names = [str(i) for i in range(n_columns)]
+    with pa.memory_map(csv_file) as source:
+        source.seek(start)
+        table = pacsv.read_csv(
+            pa.BufferReader(source.read_buffer(end - start)),
+            read_options=pacsv.ReadOptions(column_names=names),
+            parse_options=pacsv.ParseOptions(newlines_in_values=True, ignore_empty_lines=False),
+            convert_options=pacsv.ConvertOptions(column_types=dict.fromkeys(names, pa.string())))
+    df = table.to_pandas()
+    
+    # Una línea vacía llega como una fila sin ningún campo con contenido
+    first_empty = df[names[0]] == ''
+    if first_empty.any() and (df[first_empty] == '').all(axis=1).any():
+        return None
+    return df
+
+def _repair_frame(df, date_columns, now_str):
+    """
+    Repara en su lugar las columnas de fecha de df. Devuelve las primeras 5
+    correcciones como (fila, original, reparado) y el total de correcciones
+    """
+    import numpy as np
+    # Equivalente a line.strip() de la ruta línea por línea
+    first, last = df.columns[0], df.columns[-1]
+    df[first] = df[first].str.lstrip()
+    df[last] = df[last].str.rstrip()
+    
+    changes = []
+    for col_idx, _ in date_columns:
+        if col_idx >= len(df.columns):
+            continue
+        col = df.columns[col_idx]
+        original = df[col]
+        repaired = _repair_date_column(original, now_str)
+        changed = np.flatnonzero((repaired != original).to_numpy())
+        changes.extend((row, col_idx, original.iat[row], repaired.iat[row]) for row in changed[:5])
+        changes.extend((row, col_idx, None, None) for row in changed[5:])
+        df[col] = repaired
+    
+    # Las primeras 5 correcciones, en orden de línea como la ruta línea por línea
+    first_changes = [(row, original_value, repaired_value)
+                     for row, _, original_value, repaired_value in sorted(changes, key=lambda c: c[:2])[:5]]
+    return first_changes, len(changes)
+
+def _repair_in_parallel(csv_file, output_file, head_lines, n_columns, date_columns, now_str):
+    """
+    Ruta vectorizada repartida entre procesos por rangos de bytes alineados a fin
+    de línea. Devuelve (líneas procesadas, correcciones) o None si algún rango
+    no puede repararse por separado
+    """
+    ranges = _byte_ranges(csv_file, _data_start(csv_file), os.cpu_count())
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(_repair_chunk, csv_file, start, end, n_columns, date_columns, now_str)
+                   for start, end in ranges]
+        results = [future.result() for future in futures]
+    
+    if any(result is None for result in results):
+        return None
+    
+    print(f"\nAPLICANDO CORRECCIONES DE FECHA ({len(ranges)} procesos)...")
+    
+    # Numerar las filas de cada rango a continuación de las anteriores
+    first_changes = []
+    rows_before = 0
+    for _, rows, chunk_changes, _ in results:
+        first_changes.extend((row + rows_before, original_value, repaired_value)
+                             for row, original_value, repaired_value in chunk_changes)
+        rows_before += rows
+    
+    for row, original_value, repaired_value in first_changes[:5]:
+        print(f"  Línea {row + 2}: '{original_value}' → '{repaired_value}'")
+    
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        f.write('\n'.join(head_lines) + '\n')
+        f.write(''.join(text for text, _, _, _ in results))
+    
+    return rows_before + len(head_lines), sum(count for _, _, _, count in results)
+
+def _byte_ranges(csv_file, data_start, parts):
+    """
+    Divide los datos (desde data_start) en hasta parts rangos [inicio, fin)
+    cuyos límites caen justo después de un salto de línea
+    """
+    size = os.path.getsize(csv_file)
+    step = max((size - data_start) // parts, 1)
+    bounds = [data_start]
+    with open(csv_file, 'rb') as f:
+        for k in range(1, parts):
+            f.seek(data_start + k * step)
+            f.readline()
+            if f.tell() >= size:
+                break
+            if f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _repair_chunk(csv_file, start, end, n_columns, date_columns, now_str):
+    """
+    Repara un rango de bytes del archivo en un proceso aparte. Devuelve
+    (texto CSV reparado, filas, primeras 5 correcciones, total de correcciones)
+    o None si el rango no puede repararse por separado
+    """
+    # Un campo entre comillas podría contener saltos de línea y cruzar el límite del rango
+    with open(csv_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm.find(b'"', start, end) != -1:
+            return None
+    
+    # Mismas comprobaciones de filas incompletas y líneas vacías que la ruta de un solo proceso
+    df = _read_data_rows(csv_file, start, end, n_columns)
+    if df is None:
+        return None
+    
+    first_changes, corrections_made = _repair_frame(df, date_columns, now_str)
+    text = df.to_csv(header=False, index=False, lineterminator='\n')
+    return text, len(df), first_changes, corrections_made
+
+def _repair_date_column(values, now_str):
+    """
+    Versión por columnas de repair_date_field: mismos casos y mismo orden de
+    formatos, aplicados con pd.to_datetime sobre las filas aún sin resolver
+    """
+    import pandas as pd
+    import numpy as np
+    stripped = values.str.strip()
+    repaired = stripped.copy()
+    
+    # Campos vacíos: se dejan exactamente como estaban
+    empty = (stripped == '').to_numpy()
+    repaired[empty] = values[empty]
+    
+    # Valores que claramente no son fechas: fecha actual
+    non_date = stripped.str.upper().isin(_NON_DATE).to_numpy()
+    repaired[non_date] = now_str
+    
+    # Fechas reconocibles: se prueba cada formato solo con lo que aún no encajó
+    pending = ~(empty | non_date)
+    for fmt in _DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(stripped[pending], format=fmt, errors='coerce')
+        ok = parsed.notna()
+        repaired[ok.index[ok]] = parsed[ok].dt.strftime(_OUTPUT_FORMAT)
+        pending[np.flatnonzero(pending)[ok.to_numpy()]] = False
+    
+    return repaired
+
+def repair_date_field(value, now_str=None):
+    """
+    Repara un campo individual que debería ser una fecha; now_str es la fecha
+    actual ya formateada, para no recalcularla en cada campo
     """
     if not value or value.strip() == '':
         return value
     
     value_str = str(value).strip()
     
-    # Caso 1: El valor "OPEN" - reemplazar con fecha actual
-    if value_str.upper() == 'OPEN':
-        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    # Caso 1: Valores que claramente no son fechas (OPEN, WPA2...) - fecha actual
+    if value_str.upper() in _NON_DATE:
+        return now_str or time.strftime(_OUTPUT_FORMAT)
     
-    # Caso 2: Valores que claramente no son fechas
-    non_date_values = ['WPA2', 'WPA', 'WEP', 'OPN', 'OPEN', 'UNKNOWN', 'N/A', 'NULL']
-    if value_str.upper() in non_date_values:
-        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Caso 3: Fechas en formato incorrecto pero reconocible
-    try:
-        # Intentar parsear varios formatos de fecha
-        formats_to_try = [
-            '%Y-%m-%d %H:%M:%S',
-            '%d/%m/%Y %H:%M:%S',
-            '%m/%d/%Y %H:%M:%S',
-            '%Y/%m/%d %H:%M:%S',
-            '%d-%m-%Y %H:%M:%S',
-            '%m-%d-%Y %H:%M:%S',
-            '%Y%m%d%H%M%S',
-        ]
-        
-        for fmt in formats_to_try:
-            try:
-                parsed_date = datetime.strptime(value_str, fmt)
-                return parsed_date.strftime('%Y-%m-%d %H:%M:%S')  # Convertir a formato estándar
-            except ValueError:
-                continue
-    except:
-        pass
+    # Caso 2: Fechas en formato incorrecto pero reconocible; solo se prueban
+    # los formatos que admite el inicio del valor (como mucho dos)
+    for fmt in _candidate_formats(value_str):
+        try:
+            return datetime.strptime(value_str, fmt).strftime(_OUTPUT_FORMAT)  # Convertir a formato estándar
+        except ValueError:
+            continue
     
     # Si no se pudo reparar, devolver el valor original
     return value_str
 
+def _candidate_formats(value_str):
+    """
+    Formatos de _DATE_FORMATS que pueden encajar con value_str según sus
+    dígitos iniciales y el separador que los sigue, en el orden original
+    """
+    m = _DATE_LEAD_RE.match(value_str)
+    if m is None:
+        # %Y exige cuatro cifras al inicio del formato compacto
+        return _COMPACT_FORMATS if value_str[:4].isdigit() else ()
+    return _FORMATS_BY_LEAD.get((len(m[1]), m[2]), ())
+
 def validate_date_repair(repaired_file):
     """
     Valida que las fechas en el archivo reparado sean correctas
     """
+    import pandas as pd
     print(f"\n🔍 VALIDANDO REPARACIÓN DE FECHAS: {repaired_file}")
     
     try:
-        # Leer con pandas para validar
-        df = pd.read_csv(repaired_file, skiprows=1)
+        # Leer con pandas para validar: motor pyarrow (multihilo) si está disponible.
+        # Ese motor ignora skiprows, por eso los encabezados se indican con header=1
+        try:
+            df = pd.read_csv(repaired_file, header=1, engine='pyarrow', dtype_backend='pyarrow')
+        except (ImportError, ValueError):
+            df = pd.read_csv(repaired_file, skiprows=1)
         
         print("INFORMACIÓN DEL DATAFRAME REPARADO:")
         print(f"   - Filas: {len(df)}")
         print(f"   - Columnas: {list(df.columns)}")
         
         # Identificar columnas que parecen ser de fecha
-        date_cols = []
-        for col in df.columns:
-            if any(keyword in col.upper() for keyword in ['TIME', 'DATE', 'SEEN', 'FIRST', 'LAST']):
-                date_cols.append(col)
+        date_cols = [col for _, col in _detect_date_columns(df.columns)]
         
         print(f"   - Columnas de fecha identificadas: {date_cols}")
         
@@ -250,17 +580,16 @@ def validate_date_repair(repaired_file):
             if col in df.columns:
                 print(f"\nANÁLISIS DE LA COLUMNA '{col}':")
                 
-                # Mostrar tipos de datos únicos
-                unique_types = df[col].apply(lambda x: type(x).__name__).unique()
-                print(f"   - Tipos de datos: {unique_types}")
+                # Mostrar el tipo de datos de la columna (sin recorrer fila por fila)
+                print(f"   - Tipo de datos: {df[col].dtype}")
                 
                 # Mostrar algunos valores únicos
                 unique_values = df[col].dropna().unique()
                 print(f"   - Valores únicos (primeros 5): {unique_values[:5]}")
                 
-                # Intentar convertir a datetime
+                # Intentar convertir a datetime con el formato que deja la reparación
                 try:
-                    date_series = pd.to_datetime(df[col], errors='coerce', format='mixed')
+                    date_series = pd.to_datetime(df[col], errors='coerce', format=_OUTPUT_FORMAT, cache=True)
                     valid_dates = date_series.notna().sum()
                     invalid_dates = date_series.isna().sum()
                     
@@ -362,6 +691,7 @@ def main():
     parser.add_argument('--solo-analisis', action='store_true', help='Solo analizar sin reparar')
     parser.add_argument('--validar', action='store_true', help='Validar archivo reparado')
     parser.add_argument('--crear-loader', action='store_true', help='Crear script de carga inteligente')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar el progreso de la reparación')
     
     args = parser.parse_args()
     
@@ -382,7 +712,7 @@ def main():
             print(f"\nRESUMEN: No se encontraron problemas de fecha evidentes")
     else:
         # Reparación completa
-        repaired_file = repair_date_issues(args.archivo, args.output)
+        repaired_file = repair_date_issues(args.archivo, args.output, verbose=args.verbose)
         
         if repaired_file and args.validar:
             validate_date_repair(repaired_file)
@@ -393,8 +723,5 @@ def main():
     print("\n" + "=" * 50)
     print("PROCESO COMPLETADO")
 
-# Import necesario para las funciones de fecha
-import re
-
 if __name__ == "__main__":
     main()
\ No newline at end of file